@@ -13,7 +13,13 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import tkinter as tk
 from tkinter import ttk, messagebox
 import time
-from typing import Optional, Dict, Tuple
+import threading
+import queue
+import multiprocessing
+from bisect import bisect_right
+from functools import partial
+from collections import deque
+from typing import Optional, Dict, Tuple, List, Callable, Deque, Generator
 
 from src.core.board import SudokuBoard
 from src.core.generator import PuzzleGenerator
@@ -23,12 +29,111 @@ from src.solvers import (
     AC3Solver, 
     BacktrackingSolver, 
     IterativeBacktrackingSolver,
+    BaseSolver,
     StepType,
     SolveStep
 )
 from src.ui.animation import AnimationController, AnimationState
 
 
+# Shortest interval between animation paints (~50 fps)
+ANIMATION_FRAME_MS = 20
+
+# Most steps one animation tick may run when catching up
+ANIMATION_MAX_BATCH = 100
+
+# Solver steps the animation thread may run ahead of the display, sent to
+# the Tk thread in batches
+ANIMATION_QUEUE_SIZE = 256
+ANIMATION_STEP_BATCH = 32
+
+# Number of moves kept for undo; older moves are dropped
+MAX_HISTORY = 500
+
+# Conflicting cells named in the Check warning
+MAX_LISTED_CONFLICTS = 10
+
+# Boards whose comparison results are kept for a repeated Compare
+COMPARE_CACHE_SIZE = 16
+
+
+# Solver classes by display name; comparison workers build their own instances
+_SOLVER_CLASSES = {
+    "Constraint Propagation": ConstraintPropagationSolver,
+    "AC-3": AC3Solver,
+    "Backtracking": BacktrackingSolver,
+    "Iterative Backtracking": IterativeBacktrackingSolver
+}
+
+
+def _compare_worker(name: str, jobs, results):
+    """Solve boards sent on jobs with one algorithm until None arrives (comparison worker process)"""
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        job_id, size, grid = job
+        try:
+            # Fresh solver per job: the queue pickles metrics after put() returns
+            result, metrics = _SOLVER_CLASSES[name]().solve(SudokuBoard(size, grid))
+            results.put((job_id, bool(result and result.is_solved()), metrics, None))
+        except Exception as e:
+            results.put((job_id, False, None, str(e)))
+
+
+def _produce_steps(step_gen: Generator, steps: queue.Queue, cancel: threading.Event):
+    """
+    Run a solver's step generator into steps (animation thread).
+    
+    Steps are sent in lists of up to ANIMATION_STEP_BATCH, followed by None
+    once the generator is done.
+    """
+    def put(item) -> bool:
+        # Bounded queue: wait for the animation to catch up, unless cancelled
+        while not cancel.is_set():
+            try:
+                steps.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    try:
+        batch = []
+        for step in step_gen:
+            batch.append(step)
+            if len(batch) == ANIMATION_STEP_BATCH:
+                if not put(batch):
+                    return
+                batch = []
+        if batch:
+            put(batch)
+    finally:
+        put(None)
+
+
+def _consume_steps(steps: queue.Queue, cancel: threading.Event,
+                   pending: Deque[SolveStep]) -> Generator[SolveStep, None, None]:
+    """
+    Yield the steps sent by _produce_steps until its closing None or cancellation.
+    
+    Each received batch is unpacked into pending, so the caller can tell
+    whether a step is ready without blocking.
+    """
+    while True:
+        while pending:
+            yield pending.popleft()
+        try:
+            batch = steps.get(timeout=0.1)
+        except queue.Empty:
+            if cancel.is_set():
+                return
+            continue
+        if batch is None:
+            return
+        pending.extend(batch)
+
+
 class SudokuGame:
     """Main Sudoku Game Application with GUI"""
     
@@ -59,18 +164,37 @@ class SudokuGame:
             'border': '#d0d0d0',
             'border_strong': '#4a90e2'
         }
+        # Colors animated cells fade back to
+        self._color_cell_bg = self.colors['cell_bg']
+        self._color_cell_original = self.colors['cell_original']
+        # Animation color for each step type; other types use cell_bg
+        self._step_colors: Dict[StepType, str] = {
+            StepType.ASSIGN: self.colors['cell_assign'],
+            StepType.TRY: self.colors['cell_try'],
+            StepType.BACKTRACK: self.colors['cell_backtrack'],
+            StepType.PROPAGATE: self.colors['cell_propagate'],
+            StepType.REVISE: self.colors['cell_revise']
+        }
+        # Step types that place a value in the cell
+        self._flash_types = frozenset((StepType.ASSIGN, StepType.PROPAGATE))
         
         # Game state
         self.current_board: Optional[SudokuBoard] = None
         self.original_board: Optional[SudokuBoard] = None
         self.board_size = 9
         self.difficulty = "medium"
+        self._update_geometry()
         self.selected_algorithm = "Constraint Propagation"
         self.hints_used = 0
-        self.start_time = None
+        self.start_time = None  # time.perf_counter() at puzzle start
         self.timer_running = False
-        self.move_history = []
-        self.redo_stack = []
+        self.timer_id = None
+        self._timer_text = ""
+        # (runtime, nodes, backtracks, reductions) shown in metrics_label, or None
+        self._shown_metrics: Optional[Tuple[float, int, int, int]] = None
+        # Moves are stored as (row, col, old_value, new_value) diffs
+        self.move_history: Deque[Tuple[int, int, int, int]] = deque(maxlen=MAX_HISTORY)
+        self.redo_stack: Deque[Tuple[int, int, int, int]] = deque(maxlen=MAX_HISTORY)
         
         # Animation controller
         self.animation = AnimationController()
@@ -78,26 +202,73 @@ class SudokuGame:
         self.animation.on_state_change = self._on_animation_state_change
         self.animation.on_finished = self._on_animation_finished
         self.animation_timer_id = None
+        # Steps produced by the solver thread of the current animation
+        self._step_queue: Optional[queue.Queue] = None
+        self._step_cancel: Optional[threading.Event] = None
+        self._step_pending: Deque[SolveStep] = deque()
+        # Clock of the last animation tick and the fraction of a step carried over
+        self._anim_tick_time: Optional[float] = None
+        self._anim_step_credit = 0.0
+        # Steps waiting to be painted; flushed together from an idle callback
+        self._anim_queue: Deque[Tuple[SolveStep, int]] = deque()
+        self._anim_flush_id = None
+        # Animation colors waiting to fade: cell -> perf_counter() deadline,
+        # served by one timer set for the earliest deadline
+        self._color_resets: Dict[Tuple[int, int], float] = {}
+        self._color_reset_id = None
+        self._color_reset_due = 0.0
         self.animation_board_state: Dict[Tuple[int, int], int] = {}  # Track board state during animation
-        
-        # Solvers
-        self.solvers = {
-            "Constraint Propagation": ConstraintPropagationSolver(),
-            "AC-3": AC3Solver(),
-            "Backtracking": BacktrackingSolver(),
-            "Iterative Backtracking": IterativeBacktrackingSolver()
-        }
+        self.busy = False  # A solve or comparison is running in the background
+        # Puzzle (original_board) of the solve thread still running, if any.
+        # Threads cannot be stopped, so Solve stays off until it returns, even
+        # when the puzzle has been replaced since
+        self._solving_puzzle: Optional[SudokuBoard] = None
+        # Comparison worker processes, kept between runs: name -> (process, jobs, results)
+        self._compare_workers: Dict[str, tuple] = {}
+        self._compare_job = 0
+        # Job each worker was sent and has not answered yet: name -> job id
+        self._compare_running: Dict[str, int] = {}
+        self._compare_poll_id = None
+        # Results of earlier comparisons by (size, board contents), oldest first
+        self._compare_cache: Dict[tuple, Tuple[list, Optional[str]]] = {}
+        # Comparison window widgets, built on first use and then only hidden
+        self._comp_widgets: Optional[Dict[str, tk.Widget]] = None
+        
+        # Solvers, created on first use by _get_solver
+        self.solvers: Dict[str, BaseSolver] = {}
         
         # Generator
         self.generator = PuzzleGenerator()
         
         # UI elements
-        self.cells: Dict[Tuple[int, int], tk.Entry] = {}
-        self.conflict_cells: set = set()
+        # Per-cell lists indexed by row * size + col: canvas item ids
+        # (rectangle, text) and the color and value each cell shows
+        self.cells: List[Tuple[int, int]] = []
+        self._ui_size: Optional[int] = None  # Board size the cells were drawn for
+        self._cell_bg: List[str] = []
+        self._cell_value: List[int] = []
+        self._pending_change: Optional[Tuple[str, Tuple[int, int]]] = None
+        # 1 at row * size + col for each cell whose value repeats in a zone
+        self._conflict_mask = bytearray()
+        self._conflict_count = 0
+        
+        # How often each digit appears per row/column/box, kept in step with
+        # current_board so conflicts can be updated per edit
+        self._row_counts: List[List[int]] = []
+        self._col_counts: List[List[int]] = []
+        self._box_counts: List[List[int]] = []
+        self._filled = 0  # Non-empty cells on current_board
         self.selected_cell: Optional[Tuple[int, int]] = None
         
         self._create_ui()
     
+    def _get_solver(self, name: str) -> BaseSolver:
+        """Get the shared solver instance for an algorithm, creating it on first use"""
+        solver = self.solvers.get(name)
+        if solver is None:
+            solver = self.solvers[name] = _SOLVER_CLASSES[name]()
+        return solver
+    
     def _center_window(self, width: int, height: int):
         """Center window on screen"""
         screen_width = self.root.winfo_screenwidth()
@@ -143,7 +314,7 @@ class SudokuGame:
                 font=("Arial", 10), bg=self.colors['bg']).pack(side=tk.LEFT, padx=(20, 5))
         self.algo_var = tk.StringVar(value="Constraint Propagation")
         algo_menu = ttk.Combobox(control_frame, textvariable=self.algo_var,
-                                values=list(self.solvers.keys()), state="readonly", width=20)
+                                values=list(_SOLVER_CLASSES), state="readonly", width=20)
         algo_menu.pack(side=tk.LEFT, padx=5)
         
         # Button panel
@@ -155,6 +326,13 @@ class SudokuGame:
         style.configure('Primary.TButton', font=('Arial', 9, 'bold'), padding=(12, 8))
         style.configure('Secondary.TButton', font=('Arial', 9), padding=(10, 6))
         style.configure('Animation.TButton', font=('Arial', 9, 'bold'), padding=(12, 8))
+        style.configure('Comparison.Treeview', font=('Arial', 10), rowheight=30)
+        style.configure('Comparison.Treeview.Heading', font=('Arial', 10, 'bold'))
+        # Comparison window; 'X.Comparison.TLabel' inherits from 'Comparison.TLabel'
+        style.configure('Comparison.TFrame', background='#f5f7fa')
+        style.configure('Comparison.TLabel', font=('Arial', 10), background='#f5f7fa', foreground='#666')
+        style.configure('Title.Comparison.TLabel', font=('Arial', 16, 'bold'), foreground='#2c3e50')
+        style.configure('Legend.Comparison.TLabel', font=('Arial', 9))
         
         # Button row 1
         row1 = ttk.Frame(button_frame)
@@ -162,14 +340,18 @@ class SudokuGame:
         
         ttk.Button(row1, text="🆕 New Puzzle", command=self._new_puzzle,
                   style='Primary.TButton').pack(side=tk.LEFT, padx=4, expand=True, fill=tk.X)
-        ttk.Button(row1, text="💡 Get Hint", command=self._get_hint,
-                  style='Primary.TButton').pack(side=tk.LEFT, padx=4, expand=True, fill=tk.X)
-        ttk.Button(row1, text="⚡ Solve", command=self._solve_puzzle,
-                  style='Primary.TButton').pack(side=tk.LEFT, padx=4, expand=True, fill=tk.X)
-        ttk.Button(row1, text="📊 Compare", command=self._compare_algorithms,
-                  style='Primary.TButton').pack(side=tk.LEFT, padx=4, expand=True, fill=tk.X)
-        ttk.Button(row1, text="🎬 Animate", command=self._solve_animated,
-                  style='Animation.TButton').pack(side=tk.LEFT, padx=4, expand=True, fill=tk.X)
+        self.hint_btn = ttk.Button(row1, text="💡 Get Hint", command=self._get_hint,
+                                   style='Primary.TButton')
+        self.hint_btn.pack(side=tk.LEFT, padx=4, expand=True, fill=tk.X)
+        self.solve_btn = ttk.Button(row1, text="⚡ Solve", command=self._solve_puzzle,
+                                    style='Primary.TButton')
+        self.solve_btn.pack(side=tk.LEFT, padx=4, expand=True, fill=tk.X)
+        self.compare_btn = ttk.Button(row1, text="📊 Compare", command=self._compare_algorithms,
+                                      style='Primary.TButton')
+        self.compare_btn.pack(side=tk.LEFT, padx=4, expand=True, fill=tk.X)
+        self.animate_btn = ttk.Button(row1, text="🎬 Animate", command=self._solve_animated,
+                                      style='Animation.TButton')
+        self.animate_btn.pack(side=tk.LEFT, padx=4, expand=True, fill=tk.X)
         
         # Button row 2
         row2 = ttk.Frame(button_frame)
@@ -190,9 +372,20 @@ class SudokuGame:
         self.animation_frame = tk.Frame(button_frame, bg="#fff3e0")
         self._create_animation_controls()
         
-        # Board container
+        # Board container: the whole grid is drawn on one canvas
         self.board_frame = tk.Frame(main_frame, bg=self.colors['bg'])
         self.board_frame.pack(pady=20)
+        self.canvas = tk.Canvas(self.board_frame, bg=self.colors['bg'], highlightthickness=0)
+        self.canvas.pack()
+        self.canvas.bind('<Button-1>', self._on_canvas_click)
+        
+        # Keyboard input for the selected cell goes through one off-screen entry
+        self.cell_editor = tk.Entry(self.board_frame, width=2)
+        self.cell_editor.place(x=-100, y=-100)
+        self.cell_editor.bind('<KeyRelease>', self._on_cell_key_release)
+        for key, (d_row, d_col) in {'<Up>': (-1, 0), '<Down>': (1, 0),
+                                    '<Left>': (0, -1), '<Right>': (0, 1)}.items():
+            self.cell_editor.bind(key, lambda e, dr=d_row, dc=d_col: self._move_selection(dr, dc))
         
         # Status bar
         status_frame = tk.Frame(main_frame, bg=self.colors['bg'])
@@ -228,10 +421,13 @@ class SudokuGame:
         
         tk.Label(self.animation_frame, text="Speed:", bg="#fff3e0").pack(side=tk.LEFT, padx=(10, 2))
         self.speed_scale = tk.Scale(self.animation_frame, from_=10, to=500,
-                                    orient=tk.HORIZONTAL, length=100, bg="#fff3e0",
-                                    command=self._on_speed_change)
+                                    orient=tk.HORIZONTAL, length=100, bg="#fff3e0")
         self.speed_scale.set(100)
         self.speed_scale.pack(side=tk.LEFT, padx=2)
+        # The scale draws its own value while dragging; the animation only
+        # picks up the speed once the slider is released
+        self.speed_scale.bind('<ButtonRelease-1>', self._on_speed_change)
+        self.speed_scale.bind('<KeyRelease>', self._on_speed_change)
         
         self.animation_status = tk.Label(self.animation_frame, text="",
                                         font=("Arial", 9), bg="#fff3e0", fg="#333")
@@ -240,94 +436,342 @@ class SudokuGame:
     def _new_puzzle(self):
         """Generate a new puzzle"""
         size_str = self.size_var.get()
-        self.board_size = int(size_str.split('x')[0])
+        board_size = int(size_str.split('x')[0])
+        if board_size != self.board_size:
+            self.board_size = board_size
+            self._update_geometry()
         self.difficulty = self.diff_var.get().lower()
+        self._abandon_animation()
+        self._abandon_comparison()
         
         self.current_board = self.generator.generate(self.board_size, self.difficulty)
         self.original_board = self.current_board.copy()
+        self._set_busy(False)  # Results of any solve still running are discarded
         
         self.hints_used = 0
-        self.move_history = []
-        self.redo_stack = []
-        self.start_time = time.time()
+        self.move_history.clear()
+        self.redo_stack.clear()
+        self._display_metrics(None)
+        self.start_time = time.perf_counter()
         self.timer_running = True
         
-        self._create_board_ui()
+        # Same size as the board on screen: recolor and relabel its cells
+        # instead of redrawing the canvas
+        if self.cells and self._ui_size == self.board_size:
+            self._reset_board_ui()
+        else:
+            self._create_board_ui()
+        if self.timer_id:
+            self.root.after_cancel(self.timer_id)
         self._update_timer()
         self.status_label.config(text=f"New {self.board_size}x{self.board_size} {self.difficulty} puzzle generated!")
     
     def _create_board_ui(self):
         """Create board grid UI"""
-        for widget in self.board_frame.winfo_children():
-            widget.destroy()
-        
-        self.cells.clear()
+        self.canvas.delete('all')
+        self.cells = []
+        self._cell_bg = []
+        self._cell_value = []
+        self._color_resets.clear()
+        self._clear_selection()
+        self._ui_size = None
         
         if not self.current_board:
             return
+        self._ui_size = self.board_size
+        
+        cell_font, digit_str = self._cell_font, self._digit_str
+        pos, cell_size = self._cell_pos, self._cell_size
+        half = cell_size // 2
         
-        cell_size = max(40, 400 // self.board_size)
+        # Fixed pixel layout: cells are drawn at precomputed offsets
+        self.canvas.configure(width=self._board_px, height=self._board_px)
         
         for row in range(self.board_size):
             for col in range(self.board_size):
-                # Frame for border effects
-                box_row, box_col = row // self.current_board.box_size, col // self.current_board.box_size
-                
-                padx = (3 if col % self.current_board.box_size == 0 and col > 0 else 1, 1)
-                pady = (3 if row % self.current_board.box_size == 0 and row > 0 else 1, 1)
-                
-                cell_frame = tk.Frame(self.board_frame, bg=self.colors['border_strong'] if (box_row + box_col) % 2 == 0 else self.colors['border'])
-                cell_frame.grid(row=row, column=col, padx=padx, pady=pady)
-                
-                # Entry widget
-                entry = tk.Entry(cell_frame, width=2, font=("Arial", int(cell_size * 0.4), "bold"),
-                               justify="center", bd=0, highlightthickness=2,
-                               highlightbackground=self.colors['border'],
-                               highlightcolor=self.colors['primary'])
-                entry.pack(padx=1, pady=1)
-                entry.config(width=2)
-                entry.configure(font=("Arial", int(cell_size * 0.4), "bold"))
-                
+                x, y = pos[col] + 1, pos[row] + 1
+                value = self.current_board[row, col]
+                bg = self.colors['cell_original'] if value != 0 else self.colors['cell_bg']
+                rect = self.canvas.create_rectangle(x, y, x + cell_size, y + cell_size, fill=bg,
+                                                    outline=self._cell_outline(row, col), tags='cell')
+                text = self.canvas.create_text(x + half, y + half, text=digit_str[value],
+                                               font=cell_font, fill=self.colors['text'], tags='digit')
+                self._cell_bg.append(bg)
+                self._cell_value.append(value)
+                self.cells.append((rect, text))
+        
+        self._rebuild_conflicts()
+    
+    def _reset_board_ui(self):
+        """Show current_board on the existing cells (board size unchanged)"""
+        self._clear_selection()
+        # Blank every cell with one canvas call per item kind, then paint
+        # only the givens
+        self.canvas.itemconfigure('cell', fill=self.colors['cell_bg'])
+        self.canvas.itemconfigure('digit', text='')
+        self._cell_bg = [self.colors['cell_bg']] * len(self.cells)
+        self._cell_value = [0] * len(self.cells)
+        self._color_resets.clear()
+        for row in range(self.board_size):
+            for col in range(self.board_size):
+                if self.original_board[row, col] != 0:
+                    self._set_cell_bg(row, col, self.colors['cell_original'])
+                self._show_value(row, col, self.current_board[row, col])
+        self._rebuild_conflicts()
+    
+    def _clear_selection(self):
+        """Deselect the selected cell and drop any edit still pending for it"""
+        if self._pending_change:
+            self.root.after_cancel(self._pending_change[0])
+            self._pending_change = None
+        if self.selected_cell and self.cells:
+            row, col = self.selected_cell
+            self.canvas.itemconfigure(self.cells[row * self._ui_size + col][0], width=1,
+                                      outline=self._cell_outline(row, col))
+        self.selected_cell = None
+        self.cell_editor.config(state="normal")
+        self.cell_editor.delete(0, tk.END)
+    
+    def _cell_outline(self, row: int, col: int) -> str:
+        """Border color of an unselected cell, alternating per box"""
+        box_of = self._box_of
+        return self.colors['border_strong'] if (box_of[row] + box_of[col]) % 2 == 0 else self.colors['border']
+    
+    def _update_geometry(self):
+        """Precompute size-dependent layout values after the board size changes"""
+        size = self.board_size
+        box_size = int(size ** 0.5)
+        boxes_per_row = size // box_size
+        self._boxes_per_row = boxes_per_row
+        # Box band of each row/column index, and the rows/columns that start a new band
+        self._box_of = tuple(i // box_size for i in range(size))
+        self._thick = frozenset(i for i in range(1, size) if i % box_size == 0)
+        self._box_cells = tuple(
+            tuple((r, c) for r in range(band_row * box_size, (band_row + 1) * box_size)
+                  for c in range(band_col * box_size, (band_col + 1) * box_size))
+            for band_row in range(boxes_per_row) for band_col in range(boxes_per_row))
+        self._cell_size = max(40, 400 // size)
+        self._cell_font = ("Arial", int(self._cell_size * 0.4), "bold")
+        # Cell text for each value; 0 (empty) shows nothing
+        self._digit_str = [''] + [str(i) for i in range(1, size + 1)]
+        # Pixel offset of each row/column: 2px between cells, 4px between boxes
+        self._cell_pos = tuple(i * (self._cell_size + 2) + sum(2 for t in self._thick if t <= i)
+                               for i in range(size))
+        self._board_px = self._cell_pos[-1] + self._cell_size + 2
+    
+    def _box_index(self, row: int, col: int) -> int:
+        """Index of the box containing (row, col)"""
+        return self._box_of[row] * self._boxes_per_row + self._box_of[col]
+    
+    def _rebuild_conflicts(self):
+        """Recount digits per zone from current_board and recolor conflicting cells"""
+        size = self.board_size
+        self._row_counts = [[0] * (size + 1) for _ in range(size)]
+        self._col_counts = [[0] * (size + 1) for _ in range(size)]
+        self._box_counts = [[0] * (size + 1) for _ in range(len(self._box_cells))]
+        self._filled = 0
+        
+        for row in range(size):
+            for col in range(size):
                 value = self.current_board[row, col]
-                if value != 0:
-                    entry.insert(0, str(value))
-                    entry.config(state="readonly", bg=self.colors['cell_original'],
-                               disabledforeground=self.colors['text'])
-                else:
-                    entry.config(bg=self.colors['cell_bg'])
-                    entry.bind('<KeyRelease>', lambda e, r=row, c=col: self._on_cell_change(r, c, e))
-                    entry.bind('<FocusIn>', lambda e, r=row, c=col: self._on_cell_focus(r, c))
-                
-                self.cells[(row, col)] = entry
+                if value:
+                    self._filled += 1
+                    self._row_counts[row][value] += 1
+                    self._col_counts[col][value] += 1
+                    self._box_counts[self._box_index(row, col)][value] += 1
+        
+        self._conflict_mask = bytearray(size * size)
+        self._conflict_count = 0
+        for row in range(size):
+            for col in range(size):
+                conflict = self._in_conflict(row, col)
+                if conflict:
+                    self._conflict_mask[row * size + col] = 1
+                    self._conflict_count += 1
+                if self.original_board[row, col] == 0:
+                    self._set_cell_bg(row, col, self.colors['cell_error'] if conflict else self.colors['cell_bg'])
+    
+    def _in_conflict(self, row: int, col: int) -> bool:
+        """Check whether the value at (row, col) repeats in its row, column or box"""
+        value = self.current_board[row, col]
+        return bool(value) and (self._row_counts[row][value] > 1 or
+                                self._col_counts[col][value] > 1 or
+                                self._box_counts[self._box_index(row, col)][value] > 1)
+    
+    def _set_cell_value(self, row: int, col: int, value: int):
+        """Write a value to current_board and update the conflict state for its zones"""
+        old_value = self.current_board[row, col]
+        if old_value == value:
+            return
+        
+        box = self._box_index(row, col)
+        self._filled += bool(value) - bool(old_value)
+        if old_value:
+            self._row_counts[row][old_value] -= 1
+            self._col_counts[col][old_value] -= 1
+            self._box_counts[box][old_value] -= 1
+        if value:
+            self._row_counts[row][value] += 1
+            self._col_counts[col][value] += 1
+            self._box_counts[box][value] += 1
+        self.current_board[row, col] = value
+        
+        # Only cells sharing a row, column or box can change status
+        zone = {(row, c) for c in range(self.board_size)}
+        zone.update((r, col) for r in range(self.board_size))
+        zone.update(self._box_cells[box])
+        
+        mask, size = self._conflict_mask, self.board_size
+        for cell in zone:
+            conflict = self._in_conflict(*cell)
+            i = cell[0] * size + cell[1]
+            if conflict == mask[i]:
+                continue
+            mask[i] = conflict
+            self._conflict_count += 1 if conflict else -1
+            if self.original_board[cell] == 0:
+                self._set_cell_bg(*cell, self.colors['cell_error'] if conflict else self.colors['cell_bg'])
+    
+    def _update_board_display(self, cells=None):
+        """
+        Refresh cell text from current_board
+        
+        Args:
+            cells: Cells that may have changed, or None to refresh the whole
+                board and recount its conflicts
+        """
+        if cells is not None:
+            for row, col in cells:
+                self._show_value(row, col, self.current_board[row, col])
+            return
+        for row in range(self.board_size):
+            for col in range(self.board_size):
+                self._show_value(row, col, self.current_board[row, col])
+        self._rebuild_conflicts()
+    
+    def _update_cells(self, cells: List[Tuple[int, int, int]]):
+        """Show the given (row, col, value) entries, leaving every other cell alone"""
+        for row, col, value in cells:
+            self._show_value(row, col, value)
+    
+    def _show_value(self, row: int, col: int, value: int):
+        """Draw a value in a cell unless it already shows it"""
+        i = row * self._ui_size + col
+        if self._cell_value[i] == value:
+            return
+        self._cell_value[i] = value
+        self.canvas.itemconfigure(self.cells[i][1], text=self._digit_str[value])
+        if (row, col) == self.selected_cell:
+            self._load_editor(row, col)
+    
+    def _set_cell_bg(self, row: int, col: int, color: str):
+        """Set a cell's background, skipping the Tk call when it is already that color"""
+        i = row * self._ui_size + col
+        if self._cell_bg[i] != color:
+            self._cell_bg[i] = color
+            self.canvas.itemconfigure(self.cells[i][0], fill=color)
+    
+    def _on_canvas_click(self, event):
+        """Select the cell under the mouse"""
+        if not self.cells:
+            return
+        pos, cell_size = self._cell_pos, self._cell_size
+        row = bisect_right(pos, event.y) - 1
+        col = bisect_right(pos, event.x) - 1
+        # Clicks in the gaps between cells select nothing
+        if 0 <= row and 0 <= col and event.y <= pos[row] + cell_size and event.x <= pos[col] + cell_size:
+            self._select_cell(row, col)
+    
+    def _move_selection(self, d_row: int, d_col: int):
+        """Move the selection with the arrow keys"""
+        if self.selected_cell:
+            row, col = self.selected_cell
+            self._select_cell((row + d_row) % self.board_size, (col + d_col) % self.board_size)
+        return "break"
+    
+    def _select_cell(self, row: int, col: int):
+        """Highlight a cell and point keyboard input at it"""
+        # A pending edit belongs to the previously selected cell
+        self._flush_pending_change()
+        if self.selected_cell and self.cells:
+            old_row, old_col = self.selected_cell
+            self.canvas.itemconfigure(self.cells[old_row * self._ui_size + old_col][0], width=1,
+                                      outline=self._cell_outline(old_row, old_col))
+        rect, text = self.cells[row * self._ui_size + col]
+        self.canvas.itemconfigure(rect, width=2, outline=self.colors['primary'])
+        self.canvas.tag_raise(rect)
+        self.canvas.tag_raise(text)
+        self._on_cell_focus(row, col)
+        self._load_editor(row, col)
+        # Typing replaces the current value
+        self.cell_editor.select_range(0, tk.END)
+        self.cell_editor.focus_set()
+    
+    def _load_editor(self, row: int, col: int):
+        """Put a cell's value into the input entry; givens are read-only"""
+        value = self.current_board[row, col]
+        self.cell_editor.config(state="normal")
+        self.cell_editor.delete(0, tk.END)
+        self.cell_editor.insert(0, self._digit_str[value])
+        if self.original_board[row, col] != 0 or self._board_locked():
+            self.cell_editor.config(state="readonly")
+    
+    def _on_cell_key_release(self, event):
+        """Forward typing in the input entry to the selected cell"""
+        if self.selected_cell:
+            self._on_cell_change(*self.selected_cell, event)
     
     def _on_cell_change(self, row: int, col: int, event):
-        """Handle cell value change"""
-        if not self.current_board or self.original_board[row, col] != 0:
+        """Handle cell value change, applied once after a burst of keystrokes"""
+        if self._pending_change:
+            after_id, cell = self._pending_change
+            if cell == (row, col):
+                self.root.after_cancel(after_id)
+                self._pending_change = None
+            else:
+                self._flush_pending_change()
+        after_id = self.root.after(50, self._flush_pending_change)
+        self._pending_change = (after_id, (row, col))
+    
+    def _flush_pending_change(self):
+        """Apply a deferred cell change now, if there is one"""
+        if not self._pending_change:
+            return
+        after_id, (row, col) = self._pending_change
+        self._pending_change = None
+        self.root.after_cancel(after_id)
+        self._apply_cell_change(row, col)
+    
+    def _apply_cell_change(self, row: int, col: int):
+        """Validate a cell's text and write it to the board"""
+        if not self.current_board or self.original_board[row, col] != 0 or self._board_locked():
             return
         
-        entry = self.cells[(row, col)]
-        value = entry.get()
+        value = self.cell_editor.get()
         
         if value == '':
-            old_value = self.current_board[row, col]
-            self.current_board[row, col] = 0
-            self.move_history.append((row, col, old_value, 0))
-            self.redo_stack.clear()
-            entry.config(bg=self.colors['cell_bg'])
-        elif value.isdigit() and 1 <= int(value) <= self.board_size:
+            new_value = 0
+        elif value.isascii() and value.isdigit() and 1 <= int(value) <= self.board_size:
+            # isascii() rules out characters like '²' that pass isdigit() but not int()
             new_value = int(value)
-            old_value = self.current_board[row, col]
-            
-            if self.current_board.is_valid_move(row, col, new_value):
-                self.current_board[row, col] = new_value
-                self.move_history.append((row, col, old_value, new_value))
-                self.redo_stack.clear()
-                entry.config(bg=self.colors['cell_bg'])
-            else:
-                entry.config(bg=self.colors['cell_error'])
-                self.current_board[row, col] = new_value
         else:
-            entry.delete(0, tk.END)
+            # Not a usable number: clear the cell
+            self.cell_editor.delete(0, tk.END)
+            new_value = 0
+            self.status_label.config(text=f"Enter a number from 1 to {self.board_size}")
+        self._show_value(row, col, new_value)
+        
+        old_value = self.current_board[row, col]
+        if new_value == old_value:
+            # Navigation/modifier keys also fire KeyRelease; keep them out of
+            # the history so they don't wipe the redo stack
+            return
+        self._set_cell_value(row, col, new_value)
+        
+        # Conflicting entries stay on the board (highlighted) but not in history
+        if not self._conflict_mask[row * self.board_size + col]:
+            self.move_history.append((row, col, old_value, new_value))
+            self.redo_stack.clear()
     
     def _on_cell_focus(self, row: int, col: int):
         """Handle cell focus"""
@@ -335,6 +779,9 @@ class SudokuGame:
     
     def _get_hint(self):
         """Get hint for selected cell"""
+        if self.busy:
+            return
+        self._flush_pending_change()
         if not self.selected_cell or not self.current_board:
             messagebox.showinfo("Hint", "Please select an empty cell first!")
             return
@@ -344,43 +791,128 @@ class SudokuGame:
             messagebox.showinfo("Hint", "Cell already has a value!")
             return
         
-        solver = self.solvers[self.algo_var.get()]
-        hint = solver.get_hint(self.current_board.copy(), row, col)
+        solver = self._get_solver(self.algo_var.get())
+        # get_hint leaves the board untouched, so no copy is needed
+        hint = solver.get_hint(self.current_board, row, col)
         
         if hint:
-            entry = self.cells[(row, col)]
-            entry.delete(0, tk.END)
-            entry.insert(0, str(hint))
-            entry.config(bg=self.colors['cell_hint'])
-            self.current_board[row, col] = hint
+            self._set_cell_value(row, col, hint)
+            self._update_board_display([(row, col)])
+            self._set_cell_bg(row, col, self.colors['cell_hint'])
             self.hints_used += 1
             self.status_label.config(text=f"Hint: {hint} at ({row+1}, {col+1})")
         else:
             messagebox.showerror("Hint", "Could not find a valid hint!")
     
+    def _set_busy(self, busy: bool):
+        """Enable or disable the solver buttons while background work runs"""
+        self.busy = busy
+        state = ['disabled'] if busy else ['!disabled']
+        for button in (self.hint_btn, self.compare_btn, self.animate_btn):
+            button.state(state)
+        self.solve_btn.state(['disabled'] if busy or self._solving_puzzle is not None else ['!disabled'])
+    
+    def _run_in_background(self, func: Callable, args: tuple, on_done: Callable):
+        """
+        Run func(*args) on a daemon thread without blocking the Tk event loop.
+        
+        on_done(result, error) is called on the Tk thread once the call returns,
+        with error set to the raised exception if there was one.
+        """
+        result_queue = queue.Queue(maxsize=1)
+        
+        def worker():
+            try:
+                result_queue.put((func(*args), None))
+            except Exception as e:
+                result_queue.put((None, e))
+        
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        self.root.after(50, self._poll_background, result_queue, on_done)
+    
+    def _poll_background(self, result_queue: queue.Queue, on_done: Callable):
+        """Check a background call for completion"""
+        try:
+            result, error = result_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(50, self._poll_background, result_queue, on_done)
+            return
+        on_done(result, error)
+    
     def _solve_puzzle(self):
         """Solve the puzzle"""
         if not self.current_board:
             messagebox.showinfo("Solve", "Please generate a puzzle first!")
             return
+        if self.busy or self._solving_puzzle is not None:
+            return
+        self._flush_pending_change()
+        
+        # Background runs get their own solver instance, separate from the
+        # cached ones used on the Tk thread for hints
+        solver = _SOLVER_CLASSES[self.algo_var.get()]()
+        self._solving_puzzle = self.original_board
+        self._set_busy(True)
+        # The result replaces the board, so edits are held until it arrives
+        self.cell_editor.config(state="readonly")
+        self.status_label.config(text=f"Solving with {self.algo_var.get()}...")
+        self._run_in_background(solver.solve, (self.current_board.copy(),),
+                                partial(self._apply_solve_result, self.original_board))
+    
+    def _apply_solve_result(self, puzzle: SudokuBoard, outcome, error: Optional[Exception]):
+        """Show the result of a background solve"""
+        self._solving_puzzle = None
+        if puzzle is not self.original_board:
+            # A new puzzle was generated while solving: only release Solve
+            self._set_busy(self.busy)
+            return
+        self._set_busy(False)
         
-        solver = self.solvers[self.algo_var.get()]
-        result, metrics = solver.solve(self.current_board.copy())
-        
+        result, metrics = outcome if outcome else (None, None)
         if result and result.is_solved():
             self.current_board = result
-            self._create_board_ui()
+            self._update_board_display()
             self.timer_running = False
             self.status_label.config(text="Puzzle solved!")
-            self.metrics_label.config(text=str(metrics))
+            self._display_metrics(metrics)
         else:
+            self.status_label.config(text="")
             messagebox.showerror("Solve", "Could not solve the puzzle!")
+        # Edits were held while solving; reopen the selected cell
+        if self.selected_cell:
+            self._load_editor(*self.selected_cell)
+    
+    def _board_locked(self) -> bool:
+        """Whether a solve of the current puzzle is running, so edits must wait"""
+        return self._solving_puzzle is not None and self._solving_puzzle is self.original_board
+    
+    def _display_metrics(self, metrics: Optional[AlgorithmMetrics]):
+        """Show solver metrics below the board, or clear them for None"""
+        key = None if metrics is None else (metrics.runtime, metrics.nodes_visited,
+                                            metrics.backtrack_count, metrics.domain_reductions)
+        if key == self._shown_metrics:
+            return
+        self._shown_metrics = key
+        self.metrics_label.config(text="" if metrics is None else str(metrics))
     
     def _compare_algorithms(self):
         """Compare all algorithms with tabular display"""
         if not self.current_board:
             messagebox.showinfo("Compare", "Please generate a puzzle first!")
             return
+        if self.busy:
+            return
+        self._flush_pending_change()
+        
+        # Same board as an earlier comparison: show its results again
+        board_key = (self.board_size, tuple(map(tuple, self.current_board.board)))
+        cached = self._compare_cache.get(board_key)
+        if cached:
+            self.status_label.config(text="Comparison complete")
+            self._show_comparison_window(*cached)
+            return
         
         # Calculate timeout based on board size
         timeout_map = {9: 10, 16: 30, 25: 120}  # 9x9: 10s, 16x16: 30s, 25x25: 2min
@@ -388,16 +920,95 @@ class SudokuGame:
         
         # Show loading message
         self.status_label.config(text=f"Comparing algorithms... (max {timeout_seconds}s per algorithm)")
-        self.root.update()
-        
-        import threading
-        import queue
+        self._set_busy(True)
+        
+        # Each solver has its own worker process, so they run in parallel on
+        # separate cores and a timed-out one can simply be terminated.
+        # The queue pickles the job after put() returns, so it carries the
+        # immutable board_key snapshot rather than the editable board
+        self._compare_job += 1
+        job = (self._compare_job, self.board_size, board_key[1])
+        for name in _SOLVER_CLASSES:
+            self._get_compare_worker(name)[1].put(job)
+            self._compare_running[name] = self._compare_job
+        
+        deadline = time.perf_counter() + timeout_seconds
+        self._compare_poll_id = self.root.after(50, self._poll_compare, self._compare_job,
+                                                board_key, {}, deadline, timeout_seconds)
+    
+    def _get_compare_worker(self, name: str) -> tuple:
+        """Get the comparison worker for an algorithm, starting it if needed"""
+        worker = self._compare_workers.get(name)
+        if worker is None or not worker[0].is_alive():
+            context = multiprocessing.get_context('spawn')
+            jobs, results = context.Queue(), context.Queue()
+            process = context.Process(target=_compare_worker, args=(name, jobs, results), daemon=True)
+            process.start()
+            worker = self._compare_workers[name] = (process, jobs, results)
+        return worker
+    
+    def _stop_compare_worker(self, name: str):
+        """Terminate a worker that is still busy; it is restarted on the next comparison"""
+        self._compare_running.pop(name, None)
+        worker = self._compare_workers.pop(name, None)
+        if worker:
+            worker[0].terminate()
+    
+    def _abandon_comparison(self):
+        """Stop polling a comparison whose board is being replaced and free its workers"""
+        if self._compare_poll_id:
+            self.root.after_cancel(self._compare_poll_id)
+            self._compare_poll_id = None
+        for name, job_id in list(self._compare_running.items()):
+            if job_id == self._compare_job:
+                self._stop_compare_worker(name)
+    
+    def _poll_compare(self, job_id: int, board_key: tuple, finished: dict,
+                      deadline: float, timeout_seconds: int):
+        """Collect comparison results from the worker processes"""
+        self._compare_poll_id = None
+        for name in _SOLVER_CLASSES:
+            if name in finished or name not in self._compare_workers:
+                continue
+            process, _, results_queue = self._compare_workers[name]
+            alive = process.is_alive()
+            while True:
+                try:
+                    result_job, solved, metrics, error = results_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if result_job == job_id:  # Skip results of an abandoned comparison
+                    finished[name] = (solved, metrics, error)
+                    self._compare_running.pop(name, None)
+            # Workers that died without reporting (e.g. out of memory)
+            if name not in finished and not alive:
+                finished[name] = (False, None, f"worker exited with code {process.exitcode}")
+                self._stop_compare_worker(name)
+        
+        if len(finished) < len(_SOLVER_CLASSES) and time.perf_counter() < deadline:
+            self._compare_poll_id = self.root.after(50, self._poll_compare, job_id, board_key,
+                                                    finished, deadline, timeout_seconds)
+            return
         
-        def solve_with_timeout(solver, board, result_queue, name):
-            try:
-                result, metrics = solver.solve(board)
-                solved = result and result.is_solved()
-                result_queue.put({
+        # Fastest solver is picked while the rows are built
+        results = []
+        best_name, best_runtime = None, float('inf')
+        for name in _SOLVER_CLASSES:
+            if name not in finished:
+                self._stop_compare_worker(name)
+                results.append({
+                    'name': name,
+                    'solved': False,
+                    'runtime': timeout_seconds,
+                    'nodes': 0,
+                    'backtracks': 0,
+                    'reductions': 0,
+                    'timeout': True
+                })
+                continue
+            solved, metrics, error = finished[name]
+            if error is None:
+                results.append({
                     'name': name,
                     'solved': solved,
                     'runtime': metrics.runtime,
@@ -406,8 +1017,10 @@ class SudokuGame:
                     'reductions': metrics.domain_reductions,
                     'timeout': False
                 })
-            except Exception as e:
-                result_queue.put({
+                if solved and metrics.runtime < best_runtime:
+                    best_name, best_runtime = name, metrics.runtime
+            else:
+                results.append({
                     'name': name,
                     'solved': False,
                     'runtime': 0,
@@ -415,147 +1028,121 @@ class SudokuGame:
                     'backtracks': 0,
                     'reductions': 0,
                     'timeout': True,
-                    'error': str(e)
+                    'error': error
                 })
         
-        # Collect results with timeout
-        results = []
+        # Runs with a timeout or error are not kept, so they can be retried
+        if not any(r['timeout'] for r in results):
+            if len(self._compare_cache) >= COMPARE_CACHE_SIZE:
+                del self._compare_cache[next(iter(self._compare_cache))]
+            self._compare_cache[board_key] = (results, best_name)
         
-        for name, solver in self.solvers.items():
-            result_queue = queue.Queue()
-            thread = threading.Thread(target=solve_with_timeout, 
-                                     args=(solver, self.current_board.copy(), result_queue, name))
-            thread.daemon = True
-            thread.start()
-            thread.join(timeout=timeout_seconds)
-            
-            if thread.is_alive():
-                # Timeout occurred
-                results.append({
-                    'name': name,
-                    'solved': False,
-                    'runtime': timeout_seconds,
-                    'nodes': 0,
-                    'backtracks': 0,
-                    'reductions': 0,
-                    'timeout': True
-                })
-            else:
-                try:
-                    result = result_queue.get_nowait()
-                    results.append(result)
-                except queue.Empty:
-                    results.append({
-                        'name': name,
-                        'solved': False,
-                        'runtime': 0,
-                        'nodes': 0,
-                        'backtracks': 0,
-                        'reductions': 0,
-                        'timeout': True
-                    })
-        
-        # Create comparison window
+        self._set_busy(False)
+        self.status_label.config(text="Comparison complete")
+        self._show_comparison_window(results, best_name)
+    
+    def _build_comparison_window(self) -> Dict[str, tk.Widget]:
+        """Create the comparison window once; later runs reuse it"""
         comp_window = tk.Toplevel(self.root)
+        comp_window.withdraw()
         comp_window.title("📊 Algorithm Comparison")
         comp_window.geometry("700x350")
         comp_window.configure(bg="#f5f7fa")
         comp_window.transient(self.root)
-        comp_window.grab_set()
+        comp_window.protocol("WM_DELETE_WINDOW", self._close_comparison_window)
         
         # Title
-        tk.Label(comp_window, text="📊 Algorithm Performance Comparison",
-                font=("Arial", 16, "bold"), bg="#f5f7fa", fg="#2c3e50").pack(pady=(15, 10))
+        ttk.Label(comp_window, text="📊 Algorithm Performance Comparison",
+                  style='Title.Comparison.TLabel').pack(pady=(15, 10))
         
-        tk.Label(comp_window, text=f"Board: {self.board_size}x{self.board_size} | Difficulty: {self.difficulty}",
-                font=("Arial", 10), bg="#f5f7fa", fg="#666").pack(pady=(0, 15))
+        subtitle = ttk.Label(comp_window, style='Comparison.TLabel')
+        subtitle.pack(pady=(0, 15))
         
         # Table frame
-        table_frame = tk.Frame(comp_window, bg="#f5f7fa")
+        table_frame = ttk.Frame(comp_window, style='Comparison.TFrame')
         table_frame.pack(padx=20, pady=10, fill=tk.BOTH, expand=True)
         
         # Headers
-        headers = ["Algorithm", "Status", "Runtime", "Nodes", "Backtracks", "Reductions"]
-        col_widths = [22, 10, 12, 10, 12, 12]
-        
-        for col, (header, width) in enumerate(zip(headers, col_widths)):
-            cell = tk.Label(table_frame, text=header, font=("Arial", 10, "bold"),
-                          bg="#4a90e2", fg="white", width=width, pady=8, padx=5)
-            cell.grid(row=0, column=col, sticky="nsew", padx=1, pady=1)
-        
-        # Find best values for highlighting
-        solved_results = [r for r in results if r['solved']]
-        if solved_results:
-            best_runtime = min(r['runtime'] for r in solved_results)
-            best_nodes = min(r['nodes'] for r in solved_results)
-        else:
-            best_runtime = best_nodes = None
+        headers = ("Algorithm", "Status", "Runtime", "Nodes", "Backtracks", "Reductions")
+        col_widths = (190, 100, 100, 80, 100, 100)
+        
+        tree = ttk.Treeview(table_frame, columns=headers, show='headings',
+                            height=len(_SOLVER_CLASSES), style='Comparison.Treeview')
+        for header, width in zip(headers, col_widths):
+            tree.heading(header, text=header)
+            tree.column(header, width=width, anchor=tk.W if header == "Algorithm" else tk.CENTER)
+        tree.pack(fill=tk.BOTH, expand=True)
+        
+        # Row colors: alternating stripes, fastest solver highlighted
+        tree.tag_configure('odd', background="#ffffff")
+        tree.tag_configure('even', background="#f0f0f0")
+        tree.tag_configure('best', background="#c8e6c9")
+        
+        # Legend
+        legend_frame = ttk.Frame(comp_window, style='Comparison.TFrame')
+        legend_frame.pack(pady=(10, 5))
+        ttk.Label(legend_frame, text="🟢 = Fastest solver",
+                  style='Legend.Comparison.TLabel').pack(side=tk.LEFT, padx=10)
+        
+        # Close button
+        ttk.Button(comp_window, text="Close", command=self._close_comparison_window,
+                   style='Primary.TButton', width=15, cursor="hand2").pack(pady=15)
+        
+        return {'window': comp_window, 'subtitle': subtitle, 'tree': tree}
+    
+    def _show_comparison_window(self, results: list, best_name: Optional[str]):
+        """Show comparison results in a table window, highlighting best_name"""
+        if self._comp_widgets is None or not self._comp_widgets['window'].winfo_exists():
+            self._comp_widgets = self._build_comparison_window()
+        comp_window = self._comp_widgets['window']
+        tree = self._comp_widgets['tree']
+        
+        self._comp_widgets['subtitle'].config(
+            text=f"Board: {self.board_size}x{self.board_size} | Difficulty: {self.difficulty}")
         
         # Data rows
+        tree.delete(*tree.get_children())
         for row_idx, data in enumerate(results, start=1):
-            bg_color = "#ffffff" if row_idx % 2 == 1 else "#f0f0f0"
-            
-            # Algorithm name
-            tk.Label(table_frame, text=data['name'], font=("Arial", 10),
-                    bg=bg_color, fg="#2c3e50", width=col_widths[0], pady=6, anchor="w", padx=5).grid(
-                    row=row_idx, column=0, sticky="nsew", padx=1, pady=1)
-            
-            # Status
             if data.get('timeout'):
                 status_text = "⏱️ Timeout"
-                status_color = "#f39c12"
             elif data['solved']:
                 status_text = "✅ Solved"
-                status_color = "#27ae60"
             else:
                 status_text = "❌ Failed"
-                status_color = "#e74c3c"
-            tk.Label(table_frame, text=status_text, font=("Arial", 10, "bold"),
-                    bg=bg_color, fg=status_color, width=col_widths[1], pady=6).grid(
-                    row=row_idx, column=1, sticky="nsew", padx=1, pady=1)
             
-            # Runtime (highlight best)
-            runtime_bg = "#c8e6c9" if data['solved'] and data['runtime'] == best_runtime else bg_color
-            tk.Label(table_frame, text=f"{data['runtime']:.4f}s", font=("Arial", 10),
-                    bg=runtime_bg, fg="#2c3e50", width=col_widths[2], pady=6).grid(
-                    row=row_idx, column=2, sticky="nsew", padx=1, pady=1)
-            
-            # Nodes (highlight best)
-            nodes_bg = "#c8e6c9" if data['solved'] and data['nodes'] == best_nodes else bg_color
-            tk.Label(table_frame, text=str(data['nodes']), font=("Arial", 10),
-                    bg=nodes_bg, fg="#2c3e50", width=col_widths[3], pady=6).grid(
-                    row=row_idx, column=3, sticky="nsew", padx=1, pady=1)
-            
-            # Backtracks
-            tk.Label(table_frame, text=str(data['backtracks']), font=("Arial", 10),
-                    bg=bg_color, fg="#2c3e50", width=col_widths[4], pady=6).grid(
-                    row=row_idx, column=4, sticky="nsew", padx=1, pady=1)
+            if data['name'] == best_name:
+                tag = 'best'
+            else:
+                tag = 'odd' if row_idx % 2 == 1 else 'even'
             
-            # Domain reductions
-            tk.Label(table_frame, text=str(data['reductions']), font=("Arial", 10),
-                    bg=bg_color, fg="#2c3e50", width=col_widths[5], pady=6).grid(
-                    row=row_idx, column=5, sticky="nsew", padx=1, pady=1)
-        
-        # Legend
-        legend_frame = tk.Frame(comp_window, bg="#f5f7fa")
-        legend_frame.pack(pady=(10, 5))
-        tk.Label(legend_frame, text="🟢 = Best performance", font=("Arial", 9),
-                bg="#f5f7fa", fg="#666").pack(side=tk.LEFT, padx=10)
+            tree.insert('', 'end', values=(data['name'], status_text, f"{data['runtime']:.4f}s",
+                                           data['nodes'], data['backtracks'], data['reductions']),
+                        tags=(tag,))
         
-        # Close button
-        tk.Button(comp_window, text="Close", command=comp_window.destroy,
-                 font=("Arial", 10), width=15, bg="#4a90e2", fg="white",
-                 activebackground="#357abd", cursor="hand2").pack(pady=15)
+        comp_window.deiconify()
+        comp_window.lift()
+        comp_window.grab_set()
+    
+    def _close_comparison_window(self):
+        """Hide the comparison window so the next comparison can reuse it"""
+        comp_window = self._comp_widgets['window']
+        comp_window.grab_release()
+        comp_window.withdraw()
     
     def _solve_animated(self):
         """Solve with animation"""
         if not self.current_board:
             messagebox.showinfo("Animate", "Please generate a puzzle first!")
             return
+        if self.busy:
+            return
         
-        # Reset board to original state for animation
+        # Reset board to original state for animation; paints still queued
+        # from a previous run and a debounced edit are dropped
+        self._anim_queue.clear()
+        self._clear_selection()
         self.current_board = self.original_board.copy()
-        self._create_board_ui()
+        self._update_board_display()
         
         # Initialize animation board state tracking
         self.animation_board_state = {}
@@ -563,90 +1150,148 @@ class SudokuGame:
             for col in range(self.board_size):
                 self.animation_board_state[(row, col)] = self.current_board[row, col]
         
-        solver = self.solvers[self.algo_var.get()]
+        # Own instance: the step generator keeps solver state between steps.
+        # It runs on a thread so the solver is not held to the paint rate
+        solver = _SOLVER_CLASSES[self.algo_var.get()]()
         step_gen = solver.solve_with_steps(self.current_board.copy())
+        self._cancel_step_producer()
+        self._step_queue = queue.Queue(maxsize=ANIMATION_QUEUE_SIZE // ANIMATION_STEP_BATCH)
+        self._step_cancel = threading.Event()
+        self._step_pending = deque()
+        threading.Thread(target=_produce_steps, args=(step_gen, self._step_queue, self._step_cancel),
+                         daemon=True).start()
         
         self.animation.reset()
-        self.animation.start(step_gen)
+        self.animation.start(_consume_steps(self._step_queue, self._step_cancel, self._step_pending))
         self.animation.set_speed_ms(self.speed_scale.get())
         
         self.animation_frame.pack(fill=tk.X, pady=5)
+        self._cancel_animation_timer()
+        self._anim_tick_time = None
         self._run_animation_step()
     
     def _run_animation_step(self):
-        """Execute one animation step"""
+        """Execute one animation tick"""
+        self.animation_timer_id = None
         if not self.animation.is_playing():
             return
         
-        step = self.animation.step_forward()
-        if step and self.animation.should_continue():
-            delay = self.animation.get_delay_ms()
-            self.animation_timer_id = self.root.after(delay, self._run_animation_step)
+        # At most one tick per frame. The number of steps run follows the
+        # clock, so a late Tk timer catches up instead of slowing the
+        # animation down; the paints of a batch are merged by _flush_animation
+        delay = max(1, self.animation.get_delay_ms())
+        now = time.perf_counter()
+        if self._anim_tick_time is None:
+            credit = 1.0
+        else:
+            credit = self._anim_step_credit + (now - self._anim_tick_time) * 1000 / delay
+        self._anim_tick_time = now
+        batch = int(credit)
+        self._anim_step_credit = credit - batch
+        for _ in range(min(batch, ANIMATION_MAX_BATCH)):
+            # Steps not produced yet are picked up on the next tick
+            if not self._step_pending and self._step_queue.empty():
+                break
+            step = self.animation.step_forward()
+            if not (step and self.animation.is_playing() and self.animation.should_continue()):
+                return
+        self.animation_timer_id = self.root.after(max(delay, ANIMATION_FRAME_MS), self._run_animation_step)
     
     def _on_animation_step(self, step: SolveStep, index: int):
-        """Handle animation step"""
+        """Queue an animation step for the next paint"""
+        self._anim_queue.append((step, index))
+        if self._anim_flush_id is None:
+            self._anim_flush_id = self.root.after_idle(self._flush_animation)
+    
+    def _flush_animation(self):
+        """Paint all queued animation steps, touching each cell once"""
+        self._anim_flush_id = None
+        if not self._anim_queue:
+            return
+        
+        step, index = self._anim_queue[-1]
         self.animation_status.config(text=f"Step {index + 1}: {step.message}")
         
-        color_map = {
-            StepType.ASSIGN: self.colors['cell_assign'],
-            StepType.TRY: self.colors['cell_try'],
-            StepType.BACKTRACK: self.colors['cell_backtrack'],
-            StepType.PROPAGATE: self.colors['cell_propagate'],
-            StepType.REVISE: self.colors['cell_revise']
-        }
-        color = color_map.get(step.step_type, self.colors['cell_bg'])
-        
-        if 0 <= step.row < self.board_size and 0 <= step.col < self.board_size:
-            entry = self.cells.get((step.row, step.col))
-            if entry:
-                # Only modify non-original cells
-                if self.original_board and self.original_board[step.row, step.col] == 0:
-                    entry.config(bg=color, state='normal')
-                    
-                    if step.step_type == StepType.BACKTRACK:
-                        # Clear the cell on backtrack and update state
-                        entry.delete(0, tk.END)
-                        self.animation_board_state[(step.row, step.col)] = 0
-                        # Keep backtrack color visible longer
-                        self.root.after(300, lambda r=step.row, c=step.col: self._reset_cell_color(r, c))
-                    
-                    elif step.step_type == StepType.TRY:
-                        # Show TRY value with distinctive color - don't reset immediately
-                        if step.value is not None:
-                            entry.delete(0, tk.END)
-                            entry.insert(0, str(step.value))
-                        # TRY color stays until ASSIGN or BACKTRACK
-                    
-                    elif step.step_type == StepType.ASSIGN:
-                        # Assign value and update state
-                        if step.value is not None:
-                            entry.delete(0, tk.END)
-                            entry.insert(0, str(step.value))
-                            self.animation_board_state[(step.row, step.col)] = step.value
-                        # Reset to normal color after delay
-                        self.root.after(150, lambda r=step.row, c=step.col: self._reset_cell_color(r, c))
-                    
-                    elif step.step_type == StepType.PROPAGATE:
-                        # Propagate shows constraint deduction
-                        if step.value is not None:
-                            entry.delete(0, tk.END)
-                            entry.insert(0, str(step.value))
-                            self.animation_board_state[(step.row, step.col)] = step.value
-                        self.root.after(150, lambda r=step.row, c=step.col: self._reset_cell_color(r, c))
-                    
-                    elif step.step_type == StepType.REVISE:
-                        # REVISE shows domain reduction - flash the cell briefly
-                        # Don't change value, just show that domain was reduced
-                        self.root.after(100, lambda r=step.row, c=step.col: self._reset_cell_color(r, c))
+        step_colors, default_color = self._step_colors, self._color_cell_bg
+        
+        # Net effect per cell: (color, value or None if unchanged, ms until color reset)
+        paint: Dict[Tuple[int, int], Tuple[str, Optional[int], Optional[int]]] = {}
+        for step, _ in self._anim_queue:
+            cell = (step.row, step.col)
+            # Only modify non-original cells
+            if step.row < 0 or not self.original_board or self.original_board[cell] != 0:
+                continue
+            
+            color = step_colors.get(step.step_type, default_color)
+            value = paint[cell][1] if cell in paint else None
+            
+            if step.step_type == StepType.BACKTRACK:
+                # Clear the cell on backtrack; keep its color visible longer
+                value = 0
+                self.animation_board_state[cell] = 0
+                reset_ms = 300
+            elif step.step_type == StepType.TRY:
+                # TRY color stays until ASSIGN or BACKTRACK
+                if step.value is not None:
+                    value = step.value
+                reset_ms = None
+            elif step.step_type in self._flash_types:
+                if step.value is not None:
+                    value = step.value
+                    self.animation_board_state[cell] = step.value
+                reset_ms = 150
+            elif step.step_type == StepType.REVISE:
+                # Domain reduction: flash the cell briefly, value unchanged
+                reset_ms = 100
+            else:
+                reset_ms = None
+            paint[cell] = (color, value, reset_ms)
+        self._anim_queue.clear()
+        
+        now = time.perf_counter()
+        dirty = []
+        for cell, (color, value, reset_ms) in paint.items():
+            self._set_cell_bg(cell[0], cell[1], color)
+            if value is not None:
+                dirty.append((cell[0], cell[1], value))
+            # A new paint replaces any fade still pending for the cell
+            if reset_ms:
+                self._color_resets[cell] = now + reset_ms / 1000
+            else:
+                self._color_resets.pop(cell, None)
+        self._update_cells(dirty)
+        self._schedule_color_resets()
+    
+    def _schedule_color_resets(self):
+        """Set the reset timer for the earliest pending deadline"""
+        if not self._color_resets:
+            return
+        due = min(self._color_resets.values())
+        if self._color_reset_id is not None:
+            if due >= self._color_reset_due:
+                return
+            self.root.after_cancel(self._color_reset_id)
+        self._color_reset_due = due
+        delay = max(1, int((due - time.perf_counter()) * 1000))
+        self._color_reset_id = self.root.after(delay, self._reset_due_colors)
+    
+    def _reset_due_colors(self):
+        """Reset every cell whose animation color has expired"""
+        self._color_reset_id = None
+        now = time.perf_counter()
+        expired = [cell for cell, due in self._color_resets.items() if due <= now]
+        for cell in expired:
+            del self._color_resets[cell]
+            self._reset_cell_color(*cell)
+        self._schedule_color_resets()
     
     def _reset_cell_color(self, row: int, col: int):
         """Reset cell color"""
-        if (row, col) in self.cells:
-            entry = self.cells[(row, col)]
+        if self.cells:
             if self.original_board and self.original_board[row, col] != 0:
-                entry.config(bg=self.colors['cell_original'])
+                self._set_cell_bg(row, col, self._color_cell_original)
             else:
-                entry.config(bg=self.colors['cell_bg'])
+                self._set_cell_bg(row, col, self._color_cell_bg)
     
     def _on_animation_state_change(self, state: AnimationState):
         """Handle animation state change"""
@@ -657,6 +1302,7 @@ class SudokuGame:
     
     def _on_animation_finished(self, success: bool):
         """Handle animation finished"""
+        self._cancel_step_producer()
         self.animation_frame.pack_forget()
         if success:
             self.status_label.config(text="Animation complete - Puzzle solved!")
@@ -667,90 +1313,135 @@ class SudokuGame:
         """Toggle pause/resume"""
         if self.animation.is_paused():
             self.animation.resume()
+            # A tick still pending from before the pause would start a second chain
+            self._cancel_animation_timer()
+            self._anim_tick_time = None
             self._run_animation_step()
         else:
             self.animation.pause()
     
+    def _cancel_step_producer(self):
+        """Let the solver thread of the current animation exit"""
+        if self._step_cancel:
+            self._step_cancel.set()
+            self._step_cancel = None
+    
+    def _cancel_animation_timer(self):
+        """Cancel the pending animation tick, if any; safe to call repeatedly"""
+        timer_id, self.animation_timer_id = self.animation_timer_id, None
+        if timer_id:
+            self.root.after_cancel(timer_id)
+    
     def _stop_animation(self):
         """Stop animation"""
+        self._cancel_step_producer()
         self.animation.stop()
-        if self.animation_timer_id:
-            self.root.after_cancel(self.animation_timer_id)
+        self._cancel_animation_timer()
         self.animation_frame.pack_forget()
     
+    def _abandon_animation(self):
+        """Stop an animation whose board is being replaced, dropping its unpainted steps"""
+        if self.animation.is_playing() or self.animation.is_paused():
+            self._stop_animation()
+        self._anim_queue.clear()
+        self._color_resets.clear()
+    
     def _step_animation(self):
         """Single step"""
         if self.animation.is_paused() or self.animation.state == AnimationState.IDLE:
             if self.animation.state == AnimationState.IDLE:
                 self._solve_animated()
                 self.animation.pause()
+        self._step_when_ready(self._step_cancel)
+    
+    def _step_when_ready(self, cancel: Optional[threading.Event]):
+        """
+        Run one step of the animation owned by cancel.
+        
+        The solver thread may not have sent the next batch yet; the step is
+        then retried on a later frame instead of blocking the Tk thread on
+        the queue. It is dropped once that animation stops or finishes.
+        """
+        if cancel is None or cancel is not self._step_cancel:
+            return
+        if not self._step_pending and self._step_queue.empty():
+            self.root.after(ANIMATION_FRAME_MS, self._step_when_ready, cancel)
+            return
         self.animation.step_forward()
     
-    def _on_speed_change(self, value):
-        """Handle speed change"""
-        self.animation.set_speed_ms(int(value))
+    def _on_speed_change(self, event=None):
+        """Apply the speed slider's value to the animation"""
+        self.animation.set_speed_ms(self.speed_scale.get())
     
     def _undo_move(self):
         """Undo last move"""
-        if not self.move_history:
+        self._flush_pending_change()
+        if not self.move_history or self._board_locked():
             return
         
         row, col, old_value, new_value = self.move_history.pop()
         self.redo_stack.append((row, col, old_value, new_value))
-        
-        self.current_board[row, col] = old_value
-        entry = self.cells[(row, col)]
-        entry.delete(0, tk.END)
-        if old_value != 0:
-            entry.insert(0, str(old_value))
+        self._restore_cell(row, col, old_value)
     
     def _redo_move(self):
         """Redo last undone move"""
-        if not self.redo_stack:
+        self._flush_pending_change()
+        if not self.redo_stack or self._board_locked():
             return
         
         row, col, old_value, new_value = self.redo_stack.pop()
         self.move_history.append((row, col, old_value, new_value))
-        
-        self.current_board[row, col] = new_value
-        entry = self.cells[(row, col)]
-        entry.delete(0, tk.END)
-        if new_value != 0:
-            entry.insert(0, str(new_value))
+        self._restore_cell(row, col, new_value)
+    
+    def _restore_cell(self, row: int, col: int, value: int):
+        """Put a value from the move history back, unless the cell already holds it"""
+        # e.g. after Solve filled in the value the history goes back to
+        if self.current_board[row, col] == value:
+            return
+        self._set_cell_value(row, col, value)
+        self._update_board_display([(row, col)])
     
     def _clear_board(self):
         """Clear to original state"""
-        if not self.original_board:
+        if not self.original_board or self._board_locked():
             return
         
+        self._abandon_animation()
+        self._clear_selection()  # A debounced edit must not land on the cleared board
         self.current_board = self.original_board.copy()
         self.move_history.clear()
         self.redo_stack.clear()
-        self._create_board_ui()
+        self._update_board_display()
     
     def _check_solution(self):
         """Check current solution"""
+        self._flush_pending_change()
         if not self.current_board:
             return
         
-        if self.current_board.is_solved():
-            elapsed = time.time() - self.start_time if self.start_time else 0
+        # Full board with no repeated digit in any zone, from the tracked state
+        if self._filled == self.board_size ** 2 and not self._conflict_count:
+            elapsed = time.perf_counter() - self.start_time if self.start_time else 0
             self.timer_running = False
             messagebox.showinfo("Congratulations! 🎉",
                               f"Puzzle solved correctly!\n\n"
                               f"Time: {int(elapsed // 60)}:{int(elapsed % 60):02d}\n"
                               f"Hints used: {self.hints_used}")
         else:
-            conflicts = []
-            for row in range(self.board_size):
-                for col in range(self.board_size):
-                    if self.current_board[row, col] != 0:
-                        c = self.current_board.get_conflicts(row, col)
-                        if c:
-                            conflicts.append((row, col))
-            
-            if conflicts:
-                messagebox.showwarning("Not Correct", f"Found {len(conflicts)} conflicting cells!")
+            if self._conflict_count:
+                # List the first few conflicting cells; find() stops scanning
+                # the mask as soon as enough are found
+                size, mask = self.board_size, self._conflict_mask
+                cells = []
+                i = mask.find(1)
+                while i >= 0 and len(cells) < MAX_LISTED_CONFLICTS:
+                    cells.append(divmod(i, size))
+                    i = mask.find(1, i + 1)
+                listed = "\n".join(f"Cell ({row + 1}, {col + 1})" for row, col in cells)
+                if self._conflict_count > len(cells):
+                    listed += f"\n...and {self._conflict_count - len(cells)} more"
+                messagebox.showwarning("Not Correct",
+                                       f"Found {self._conflict_count} conflicting cells!\n\n{listed}")
             else:
                 messagebox.showinfo("Incomplete", "Puzzle is not complete yet!")
     
@@ -760,10 +1451,9 @@ class SudokuGame:
             messagebox.showinfo("Stats", "No puzzle loaded!")
             return
         
-        empty = len([1 for r in range(self.board_size) for c in range(self.board_size)
-                    if self.current_board[r, c] == 0])
-        filled = self.board_size ** 2 - empty
-        elapsed = time.time() - self.start_time if self.start_time else 0
+        self._flush_pending_change()
+        filled = self._filled
+        elapsed = time.perf_counter() - self.start_time if self.start_time else 0
         
         stats = f"Board: {self.board_size}x{self.board_size}\n"
         stats += f"Difficulty: {self.difficulty}\n"
@@ -775,12 +1465,18 @@ class SudokuGame:
     
     def _update_timer(self):
         """Update timer display"""
+        self.timer_id = None
         if self.timer_running and self.start_time:
-            elapsed = time.time() - self.start_time
+            elapsed = time.perf_counter() - self.start_time
             mins = int(elapsed // 60)
             secs = int(elapsed % 60)
-            self.timer_label.config(text=f"Time: {mins:02d}:{secs:02d}")
-            self.root.after(1000, self._update_timer)
+            text = f"Time: {mins:02d}:{secs:02d}"
+            if text != self._timer_text:
+                self._timer_text = text
+                self.timer_label.config(text=text)
+            # Wake up just after the next whole second
+            delay = 1000 - int((elapsed % 1) * 1000)
+            self.timer_id = self.root.after(delay, self._update_timer)
 
 
 def main():
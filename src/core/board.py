@@ -3,7 +3,6 @@ Sudoku Board Class
 Handles the Sudoku grid, validation, and basic operations
 """
 
-import copy
 from typing import List, Optional, Tuple, Set
 
 
@@ -22,7 +21,8 @@ class SudokuBoard:
         self.box_size = int(size ** 0.5)  # 3 for 9x9, 1 for 3x3
         
         if initial_board:
-            self.board = copy.deepcopy(initial_board)
+            # Rows only hold ints, so copying each row is a full copy
+            self.board = [list(row) for row in initial_board]
         else:
             self.board = [[0 for _ in range(size)] for _ in range(size)]
     
@@ -126,14 +126,26 @@ class SudokuBoard:
     
     def is_solved(self) -> bool:
         """Check if the board is correctly solved"""
-        if not self.is_complete():
-            return False
-        
-        # Check all cells are valid
-        for row in range(self.size):
-            for col in range(self.size):
-                if not self.is_valid_move(row, col, self.board[row][col]):
+        # One pass with a bitmask per row, column and box (bit v-1 = value v);
+        # a value whose bit is already set in one of its units is a conflict
+        size, box_size = self.size, self.box_size
+        boxes_per_row = size // box_size
+        rows = [0] * size
+        cols = [0] * size
+        boxes = [0] * (boxes_per_row * boxes_per_row)
+        
+        for row in range(size):
+            box_base = (row // box_size) * boxes_per_row
+            for col, value in enumerate(self.board[row]):
+                if value == 0:
+                    return False
+                bit = 1 << (value - 1)
+                box = box_base + col // box_size
+                if (rows[row] | cols[col] | boxes[box]) & bit:
                     return False
+                rows[row] |= bit
+                cols[col] |= bit
+                boxes[box] |= bit
         
         return True
     
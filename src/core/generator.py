@@ -9,6 +9,10 @@ from src.core.board import SudokuBoard
 from src.solvers.backtracking import BacktrackingSolver
 
 
+# Share of cells left filled per difficulty; anything else counts as hard
+KEEP_RATIO = {"easy": 0.5, "medium": 0.35, "hard": 0.25}
+
+
 class PuzzleGenerator:
     """Generates Sudoku puzzles"""
     
@@ -65,13 +69,7 @@ class PuzzleGenerator:
         
         # Determine number of cells to keep
         total_cells = size * size
-        
-        if difficulty == "easy":
-            cells_to_keep = int(total_cells * 0.5)  # 50% filled
-        elif difficulty == "medium":
-            cells_to_keep = int(total_cells * 0.35)  # 35% filled
-        else:  # hard
-            cells_to_keep = int(total_cells * 0.25)  # 25% filled
+        cells_to_keep = int(total_cells * KEEP_RATIO.get(difficulty, KEEP_RATIO["hard"]))
         
         # Randomly remove cells
         all_cells = [(r, c) for r in range(size) for c in range(size)]
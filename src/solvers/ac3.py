@@ -2,16 +2,48 @@
 AC-3 (Arc Consistency Algorithm 3) Solver for Sudoku
 """
 
-import copy
+from array import array
 from collections import deque
-from typing import Optional, Tuple, Dict, Set, List, Generator
+from functools import lru_cache
+from typing import Optional, Tuple, Dict, Set, List, Generator, Iterator
 
 from src.core.board import SudokuBoard
 from src.core.metrics import AlgorithmMetrics
-from src.solvers.base import BaseSolver, StepType, SolveStep
+from src.solvers.base import BitmaskSolver, StepType, SolveStep
 
 
-class AC3Solver(BaseSolver):
+@lru_cache(maxsize=None)
+def arc_table(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Build the flat neighbor table AC-3 queues its arcs from.
+    
+    Holds the same cells as peer_table, but in the order a set of
+    (row, col) pairs iterates them. That is the order arcs have always been
+    revised in, and on dead-end branches the number of domain reductions
+    depends on it.
+    
+    Args:
+        size: Size of the board
+        
+    Returns:
+        Tuple indexed by row * size + col, holding the flat indices of the
+        cell's neighbors
+    """
+    box_size = int(size ** 0.5)
+    neighbors = []
+    for row in range(size):
+        for col in range(size):
+            cells = {(row, c) for c in range(size) if c != col}
+            cells.update((r, col) for r in range(size) if r != row)
+            box_row = (row // box_size) * box_size
+            box_col = (col // box_size) * box_size
+            cells.update((r, c) for r in range(box_row, box_row + box_size)
+                         for c in range(box_col, box_col + box_size) if (r, c) != (row, col))
+            neighbors.append(tuple(r * size + c for r, c in cells))
+    return tuple(neighbors)
+
+
+class AC3Solver(BitmaskSolver):
     """
     AC-3 (Arc Consistency Algorithm 3)
     Enforces binary consistency between related cells.
@@ -26,101 +58,94 @@ class AC3Solver(BaseSolver):
         """Solve using AC-3 with backtracking (MAC)"""
         self.metrics.reset()
         self.metrics.start()
-        result = self._solve_recursive(board)
+        flat = self._prepare(board)
+        result = self._solve_recursive(flat) if flat else None
+        if result:
+            self._write_back(board, result)
         self.metrics.stop()
-        return (result, self.metrics) if result else (None, self.metrics)
+        return (board, self.metrics) if result else (None, self.metrics)
     
-    def _solve_recursive(self, board: SudokuBoard) -> Optional[SudokuBoard]:
+    def _solve_recursive(self, flat: array) -> Optional[array]:
         self.metrics.nodes_visited += 1
         
         # Initialize domains
-        current_domains = {}
-        for row in range(board.size):
-            for col in range(board.size):
-                if board[row, col] == 0:
-                    current_domains[(row, col)] = board.get_domain(row, col)
-                    if not current_domains[(row, col)]:
-                        return None
-                else:
-                    current_domains[(row, col)] = {board[row, col]}
+        current_domains, empties, dead_cell = self._init_domains(flat)
+        if dead_cell >= 0:
+            return None
         
         # Run AC-3
-        if not self._ac3(board, current_domains):
+        if not self._ac3(flat, current_domains):
             return None
         
-        # Update board with singletons
-        for (row, col), domain in current_domains.items():
-            if len(domain) == 1 and board[row, col] == 0:
-                board[row, col] = next(iter(domain))
+        # Update board with singletons. Arc consistency has already removed
+        # each singleton's value from its peers, so these never clash
+        assigned = []
+        for i in range(len(flat)):
+            domain = current_domains[i]
+            if flat[i] == 0 and (domain & (domain - 1)) == 0:
+                self._place(flat, i, domain)
+                assigned.append(i)
         
-        if board.is_solved():
-            return board
+        if empties == len(assigned):
+            return flat
         
         # Backtracking with MRV
-        empty_cells = [rc for rc, val in current_domains.items() if board[rc[0], rc[1]] == 0]
-        if not empty_cells:
-            return None
-        
-        empty_cells.sort(key=lambda rc: len(current_domains[rc]))
-        row, col = empty_cells[0]
-        
-        for value in current_domains[(row, col)]:
-            new_board = board.copy()
-            new_board[row, col] = value
-            result = self._solve_recursive(new_board)
+        i = min((j for j in range(len(flat)) if flat[j] == 0),
+                key=lambda j: bin(current_domains[j]).count("1"))
+        
+        remaining = current_domains[i]
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            self._place(flat, i, bit)
+            result = self._solve_recursive(flat)
             if result:
                 return result
+            self._unplace(flat, i)
             self.metrics.backtrack_count += 1
         
+        self._undo(flat, assigned)
         return None
     
-    def _ac3(self, board, domains) -> bool:
+    def _arcs(self, flat: array, queue: deque) -> Iterator[Tuple[int, int]]:
+        """
+        Yield arcs (xi, xj) in queue order: every cell against each of its
+        neighbors, then the arcs queued by revisions as they come in.
+        
+        The initial arcs always come off the queue first, so they are walked
+        in place rather than materialised. Arcs from placed cells never
+        revise anything and are left out.
+        """
+        neighbors = arc_table(self._size)
+        for xi in range(len(flat)):
+            if flat[xi]:
+                continue
+            for xj in neighbors[xi]:
+                yield xi, xj
+        while queue:
+            yield queue.popleft()
+    
+    def _ac3(self, flat: array, domains: List[int]) -> bool:
         """Run AC-3 algorithm"""
+        neighbors = arc_table(self._size)
         queue = deque()
         
-        for row in range(board.size):
-            for col in range(board.size):
-                for neighbor in self._get_neighbors(board, row, col):
-                    queue.append(((row, col), neighbor))
-        
-        while queue:
-            (xi, xj) = queue.popleft()
-            if self._revise(domains, xi, xj):
-                if len(domains[xi]) == 0:
+        for (xi, xj) in self._arcs(flat, queue):
+            if self._revise(flat, domains, xi, xj):
+                if domains[xi] == 0:
                     return False
-                for xk in self._get_neighbors(board, xi[0], xi[1]):
-                    if xk != xj:
-                        queue.append((xk, xi))
+                queue.extend((xk, xi) for xk in neighbors[xi] if xk != xj and flat[xk] == 0)
         return True
     
-    def _get_neighbors(self, board, row, col) -> List[Tuple[int, int]]:
-        """Get all neighbors (same row, column, or box)"""
-        neighbors = set()
-        for c in range(board.size):
-            if c != col:
-                neighbors.add((row, c))
-        for r in range(board.size):
-            if r != row:
-                neighbors.add((r, col))
-        box_row = (row // board.box_size) * board.box_size
-        box_col = (col // board.box_size) * board.box_size
-        for r in range(box_row, box_row + board.box_size):
-            for c in range(box_col, box_col + board.box_size):
-                if (r, c) != (row, col):
-                    neighbors.add((r, c))
-        return list(neighbors)
-    
-    def _revise(self, domains, xi, xj) -> bool:
+    def _revise(self, flat: array, domains: List[int], xi: int, xj: int) -> bool:
         """Revise domain of xi based on xj"""
-        revised = False
-        xj_domain = domains[xj]
-        if len(xj_domain) == 1:
-            val_j = next(iter(xj_domain))
-            if val_j in domains[xi]:
-                domains[xi].remove(val_j)
-                self.metrics.domain_reductions += 1
-                revised = True
-        return revised
+        bit = domains[xj]
+        # Only a singleton xj rules a value out of xi
+        if flat[xi] == 0 and (bit & (bit - 1)) == 0 and domains[xi] & bit:
+            domains[xi] ^= bit
+            self.metrics.domain_reductions += 1
+            return True
+        return False
     
     def get_hint(self, board: SudokuBoard, row: int, col: int) -> Optional[int]:
         if board[row, col] != 0:
@@ -132,83 +157,78 @@ class AC3Solver(BaseSolver):
         """Solve with step visualization"""
         self.metrics.reset()
         self.metrics.start()
-        result = yield from self._solve_with_steps_recursive(board.copy())
+        flat = self._prepare(board)
+        if not flat:
+            self.metrics.stop()
+            yield SolveStep(StepType.FAILED, -1, -1, None, "No solution found")
+            return None
+        result = yield from self._solve_with_steps_recursive(flat)
         self.metrics.stop()
-        return result
+        if result is None:
+            # Dead ends inside the search only show up as backtracks
+            yield SolveStep(StepType.FAILED, -1, -1, None, "No solution found")
+            return None
+        solved = board.copy()
+        self._write_back(solved, result)
+        return solved
     
-    def _solve_with_steps_recursive(self, board: SudokuBoard) -> Generator[SolveStep, None, Optional[SudokuBoard]]:
+    def _solve_with_steps_recursive(self, flat: array) -> Generator[SolveStep, None, Optional[array]]:
         self.metrics.nodes_visited += 1
+        size = self._size
         
-        current_domains = {}
-        for row in range(board.size):
-            for col in range(board.size):
-                if board[row, col] == 0:
-                    current_domains[(row, col)] = board.get_domain(row, col)
-                    if not current_domains[(row, col)]:
-                        yield SolveStep(StepType.FAILED, row, col, None,
-                                       f"Empty domain at ({row+1}, {col+1})")
-                        return None
-                else:
-                    current_domains[(row, col)] = {board[row, col]}
+        current_domains, empties, dead_cell = self._init_domains(flat)
+        if dead_cell >= 0:
+            return None
         
         # AC-3 with steps
+        neighbors = arc_table(size)
         queue = deque()
-        for row in range(board.size):
-            for col in range(board.size):
-                for neighbor in self._get_neighbors(board, row, col):
-                    queue.append(((row, col), neighbor))
-        
-        while queue:
-            (xi, xj) = queue.popleft()
-            xj_domain = current_domains[xj]
-            if len(xj_domain) == 1:
-                val_j = next(iter(xj_domain))
-                if val_j in current_domains[xi]:
-                    current_domains[xi].discard(val_j)
-                    self.metrics.domain_reductions += 1
-                    yield SolveStep(StepType.REVISE, xi[0], xi[1], val_j,
-                                   f"Revised ({xi[0]+1}, {xi[1]+1}): removed {val_j}",
-                                   copy.deepcopy(current_domains))
-                    if len(current_domains[xi]) == 0:
-                        yield SolveStep(StepType.FAILED, xi[0], xi[1], None,
-                                       f"Empty domain at ({xi[0]+1}, {xi[1]+1})")
-                        return None
-                    for xk in self._get_neighbors(board, xi[0], xi[1]):
-                        if xk != xj:
-                            queue.append((xk, xi))
-        
-        for (row, col), domain in current_domains.items():
-            if len(domain) == 1 and board[row, col] == 0:
-                val = next(iter(domain))
-                board[row, col] = val
-                yield SolveStep(StepType.PROPAGATE, row, col, val,
-                               f"Assigned {val} to ({row+1}, {col+1})")
-        
-        if board.is_solved():
+        for (xi, xj) in self._arcs(flat, queue):
+            if self._revise(flat, current_domains, xi, xj):
+                row, col = divmod(xi, size)
+                val_j = current_domains[xj].bit_length()
+                yield SolveStep(StepType.REVISE, row, col, val_j,
+                               f"Revised ({row+1}, {col+1}): removed {val_j}",
+                               self._snapshot_domains(flat, current_domains))
+                if current_domains[xi] == 0:
+                    return None
+                queue.extend((xk, xi) for xk in neighbors[xi] if xk != xj and flat[xk] == 0)
+        
+        assigned = []
+        for i in range(len(flat)):
+            domain = current_domains[i]
+            if flat[i] == 0 and (domain & (domain - 1)) == 0:
+                self._place(flat, i, domain)
+                assigned.append(i)
+                row, col = divmod(i, size)
+                yield SolveStep(StepType.PROPAGATE, row, col, flat[i],
+                               f"Assigned {flat[i]} to ({row+1}, {col+1})")
+        
+        if empties == len(assigned):
             yield SolveStep(StepType.SOLVED, -1, -1, None, "Puzzle solved!")
-            return board
-        
-        empty_cells = [rc for rc in current_domains if board[rc[0], rc[1]] == 0]
-        if not empty_cells:
-            yield SolveStep(StepType.FAILED, -1, -1, None, "No empty cells but puzzle not solved")
-            return None
+            return flat
         
-        empty_cells.sort(key=lambda rc: len(current_domains[rc]))
-        row, col = empty_cells[0]
+        i = min((j for j in range(len(flat)) if flat[j] == 0),
+                key=lambda j: bin(current_domains[j]).count("1"))
+        row, col = divmod(i, size)
         
-        for value in current_domains[(row, col)]:
+        remaining = current_domains[i]
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            value = bit.bit_length()
             yield SolveStep(StepType.TRY, row, col, value,
                            f"Trying {value} at ({row+1}, {col+1})")
-            new_board = board.copy()
-            new_board[row, col] = value
+            self._place(flat, i, bit)
             yield SolveStep(StepType.ASSIGN, row, col, value,
                            f"Assigned {value} to ({row+1}, {col+1})")
-            result = yield from self._solve_with_steps_recursive(new_board)
+            result = yield from self._solve_with_steps_recursive(flat)
             if result:
                 return result
+            self._unplace(flat, i)
             self.metrics.backtrack_count += 1
             yield SolveStep(StepType.BACKTRACK, row, col, value,
                            f"Backtracking from ({row+1}, {col+1})")
         
-        yield SolveStep(StepType.FAILED, row, col, None, f"All values exhausted at ({row+1}, {col+1})")
+        self._undo(flat, assigned)
         return None
@@ -3,23 +3,25 @@ Base classes and types for Sudoku Solvers
 """
 
 from abc import ABC, abstractmethod
-from enum import Enum
+from array import array
+from enum import IntEnum
 from dataclasses import dataclass
-from typing import Optional, Tuple, Dict, Set, Generator
+from functools import lru_cache
+from typing import Optional, Tuple, Dict, Set, List, Generator
 
 from src.core.board import SudokuBoard
 from src.core.metrics import AlgorithmMetrics
 
 
-class StepType(Enum):
+class StepType(IntEnum):
     """Types of steps during solving for visualization"""
-    ASSIGN = "assign"           # Assigning a value to a cell
-    PROPAGATE = "propagate"     # Propagating constraints
-    BACKTRACK = "backtrack"     # Backtracking from a failed path
-    REVISE = "revise"           # AC-3 revision
-    TRY = "try"                 # Trying a value
-    SOLVED = "solved"           # Puzzle solved
-    FAILED = "failed"           # No solution found
+    ASSIGN = 0          # Assigning a value to a cell
+    PROPAGATE = 1       # Propagating constraints
+    BACKTRACK = 2       # Backtracking from a failed path
+    REVISE = 3          # AC-3 revision
+    TRY = 4             # Trying a value
+    SOLVED = 5          # Puzzle solved
+    FAILED = 6          # No solution found
 
 
 @dataclass
@@ -33,6 +35,33 @@ class SolveStep:
     domains: Optional[Dict[Tuple[int, int], Set[int]]] = None
 
 
+@lru_cache(maxsize=None)
+def peer_table(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Build the flat peer table for a board size.
+    
+    Args:
+        size: Size of the board
+        
+    Returns:
+        Tuple indexed by row * size + col, holding the flat indices of all
+        other cells in the same row, column or box
+    """
+    box_size = int(size ** 0.5)
+    peers = []
+    for row in range(size):
+        for col in range(size):
+            cells = {row * size + c for c in range(size)}
+            cells.update(r * size + col for r in range(size))
+            box_row = (row // box_size) * box_size
+            box_col = (col // box_size) * box_size
+            for r in range(box_row, box_row + box_size):
+                cells.update(r * size + c for c in range(box_col, box_col + box_size))
+            cells.discard(row * size + col)
+            peers.append(tuple(sorted(cells)))
+    return tuple(peers)
+
+
 class BaseSolver(ABC):
     """Abstract base class for all Sudoku solvers"""
     
@@ -84,3 +113,111 @@ class BaseSolver(ABC):
         else:
             yield SolveStep(StepType.FAILED, -1, -1, None, "No solution found")
         return result
+
+
+class BitmaskSolver(BaseSolver):
+    """
+    Base for solvers that search on a flat array copy of the board
+    (index row * size + col) and write the solution back at the end.
+    Domains and the values placed in each row/column/box are bitmasks
+    (bit v-1 set = value v).
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._size = 0
+        self._full = 0
+        self._peers: Tuple[Tuple[int, ...], ...] = ()
+        self._units: List[Tuple[int, int, int]] = []
+        self._row_mask: List[int] = []
+        self._col_mask: List[int] = []
+        self._box_mask: List[int] = []
+    
+    def _prepare(self, board: SudokuBoard) -> Optional[array]:
+        """
+        Set up size-dependent tables and the row/column/box masks
+        
+        Returns:
+            Flat copy of the board, or None if two givens conflict
+        """
+        size, box_size = board.size, board.box_size
+        boxes_per_row = size // box_size
+        self._size = size
+        self._full = (1 << size) - 1
+        self._peers = peer_table(size)
+        self._units = [(row, col, (row // box_size) * boxes_per_row + col // box_size)
+                       for row in range(size) for col in range(size)]
+        self._row_mask = [0] * size
+        self._col_mask = [0] * size
+        self._box_mask = [0] * (boxes_per_row * boxes_per_row)
+        
+        flat = array('b', (board[row, col] for row in range(size) for col in range(size)))
+        for i in range(len(flat)):
+            if flat[i]:
+                bit = 1 << (flat[i] - 1)
+                row, col, box = self._units[i]
+                if (self._row_mask[row] | self._col_mask[col] | self._box_mask[box]) & bit:
+                    return None
+                self._place(flat, i, bit)
+        return flat
+    
+    def _write_back(self, board: SudokuBoard, flat: array):
+        """Copy a flat solution back into the board"""
+        size = self._size
+        for i in range(size * size):
+            board[i // size, i % size] = flat[i]
+    
+    def _place(self, flat: array, i: int, bit: int):
+        """Put the value for bit in cell i and mark it in the masks"""
+        row, col, box = self._units[i]
+        flat[i] = bit.bit_length()
+        self._row_mask[row] |= bit
+        self._col_mask[col] |= bit
+        self._box_mask[box] |= bit
+    
+    def _unplace(self, flat: array, i: int):
+        """Clear cell i and release its value from the masks"""
+        row, col, box = self._units[i]
+        bit = 1 << (flat[i] - 1)
+        flat[i] = 0
+        self._row_mask[row] ^= bit
+        self._col_mask[col] ^= bit
+        self._box_mask[box] ^= bit
+    
+    def _undo(self, flat: array, assigned: List[int]):
+        """Release the cells filled by one propagation pass"""
+        for i in reversed(assigned):
+            self._unplace(flat, i)
+    
+    def _init_domains(self, flat: array) -> Tuple[List[int], int, int]:
+        """
+        Build candidate bitmasks from the current masks
+        
+        Returns:
+            Tuple of (domains, empty cell count, first cell with an empty
+            domain or -1)
+        """
+        full = self._full
+        row_mask, col_mask, box_mask = self._row_mask, self._col_mask, self._box_mask
+        domains = [0] * len(flat)
+        empties = 0
+        for i in range(len(flat)):
+            if flat[i] == 0:
+                row, col, box = self._units[i]
+                domain = full & ~(row_mask[row] | col_mask[col] | box_mask[box])
+                if not domain:
+                    return domains, empties, i
+                domains[i] = domain
+                empties += 1
+        return domains, empties, -1
+    
+    def _snapshot_domains(self, flat: array, domains: List[int]) -> Dict[Tuple[int, int], Set[int]]:
+        """Expand flat bitmask domains into the (row, col) keyed form used by SolveStep"""
+        size = self._size
+        snapshot = {}
+        for i in range(len(flat)):
+            if flat[i]:
+                snapshot[divmod(i, size)] = {flat[i]}
+            else:
+                snapshot[divmod(i, size)] = {v for v in range(1, size + 1) if domains[i] >> (v - 1) & 1}
+        return snapshot
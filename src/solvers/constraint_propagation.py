@@ -2,15 +2,15 @@
 Constraint Propagation Solver for Sudoku
 """
 
-import copy
-from typing import Optional, Tuple, Dict, Set, Generator
+from array import array
+from typing import Optional, Tuple, Dict, Set, List, Generator
 
 from src.core.board import SudokuBoard
 from src.core.metrics import AlgorithmMetrics
-from src.solvers.base import BaseSolver, StepType, SolveStep
+from src.solvers.base import BitmaskSolver, StepType, SolveStep
 
 
-class ConstraintPropagationSolver(BaseSolver):
+class ConstraintPropagationSolver(BitmaskSolver):
     """
     Constraint Propagation Algorithm
     Progressively reduces domains through logical elimination.
@@ -26,89 +26,75 @@ class ConstraintPropagationSolver(BaseSolver):
         self.metrics.reset()
         self.metrics.start()
         
-        result = self._solve_recursive(board)
+        # Conflicting givens are rejected up front so the recursion can
+        # treat a board with no empty cells as solved
+        flat = self._prepare(board)
+        result = self._solve_recursive(flat) if flat else None
+        if result:
+            self._write_back(board, result)
         
         self.metrics.stop()
-        return (result, self.metrics) if result else (None, self.metrics)
+        return (board, self.metrics) if result else (None, self.metrics)
     
-    def _solve_recursive(self, board: SudokuBoard) -> Optional[SudokuBoard]:
+    def _solve_recursive(self, flat: array) -> Optional[array]:
         """Recursive solver with constraint propagation"""
         self.metrics.nodes_visited += 1
         
-        # Initialize domains
-        temp_domains = {}
-        for row in range(board.size):
-            for col in range(board.size):
-                if board[row, col] == 0:
-                    temp_domains[(row, col)] = board.get_domain(row, col)
-                    if not temp_domains[(row, col)]:
-                        return None
-                else:
-                    temp_domains[(row, col)] = {board[row, col]}
+        # Initialize domains (flat list indexed by row * size + col)
+        temp_domains, empties, dead_cell = self._init_domains(flat)
+        if dead_cell >= 0:
+            return None
         
-        # Propagate constraints
+        # Propagate constraints; cells filled here are undone on failure
+        row_mask, col_mask, box_mask = self._row_mask, self._col_mask, self._box_mask
+        assigned = []
         changed = True
         while changed:
             changed = False
-            for (row, col), domain in list(temp_domains.items()):
-                if len(domain) == 1 and board[row, col] == 0:
-                    value = next(iter(domain))
-                    if not board.is_valid_move(row, col, value):
+            for i in range(len(flat)):
+                domain = temp_domains[i]
+                if (domain & (domain - 1)) == 0 and flat[i] == 0:
+                    row, col, box = self._units[i]
+                    if (row_mask[row] | col_mask[col] | box_mask[box]) & domain:
+                        self._undo(flat, assigned)
                         return None
-                    board[row, col] = value
+                    self._place(flat, i, domain)
+                    assigned.append(i)
+                    empties -= 1
                     changed = True
                     self.metrics.domain_reductions += 1
-                    if not self._update_domains(board, temp_domains, row, col, value):
+                    if not self._update_domains(flat, temp_domains, i, domain):
+                        self._undo(flat, assigned)
                         return None
         
-        if board.is_solved():
-            return board
+        if empties == 0:
+            return flat
         
         # Backtracking with MRV
-        empty_cells = [(r, c) for r in range(board.size) for c in range(board.size) 
-                       if board[r, c] == 0]
-        if not empty_cells:
-            return None
-        
-        empty_cells.sort(key=lambda cell: len(temp_domains.get(cell, set())))
-        row, col = empty_cells[0]
-        
-        for value in temp_domains.get((row, col), set()):
-            if board.is_valid_move(row, col, value):
-                new_board = board.copy()
-                new_board[row, col] = value
-                result = self._solve_recursive(new_board)
-                if result:
-                    return result
-                self.metrics.backtrack_count += 1
-        
+        i = min((j for j in range(len(flat)) if flat[j] == 0),
+                key=lambda j: bin(temp_domains[j]).count("1"))
+        
+        remaining = temp_domains[i]
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            self._place(flat, i, bit)
+            result = self._solve_recursive(flat)
+            if result:
+                return result
+            self._unplace(flat, i)
+            self.metrics.backtrack_count += 1
+        
+        self._undo(flat, assigned)
         return None
     
-    def _update_domains(self, board, domains, row, col, value):
+    def _update_domains(self, flat: array, domains: List[int], i: int, bit: int) -> bool:
         """Remove value from related domains"""
-        # Row
-        for c in range(board.size):
-            if c != col and (row, c) in domains and board[row, c] == 0:
-                domains[(row, c)].discard(value)
-                if not domains[(row, c)]:
-                    return False
-        
-        # Column
-        for r in range(board.size):
-            if r != row and (r, col) in domains and board[r, col] == 0:
-                domains[(r, col)].discard(value)
-                if not domains[(r, col)]:
+        for p in self._peers[i]:
+            if flat[p] == 0 and domains[p] & bit:
+                domains[p] ^= bit
+                if not domains[p]:
                     return False
-        
-        # Box
-        box_row = (row // board.box_size) * board.box_size
-        box_col = (col // board.box_size) * board.box_size
-        for r in range(box_row, box_row + board.box_size):
-            for c in range(box_col, box_col + board.box_size):
-                if (r, c) != (row, col) and (r, c) in domains and board[r, c] == 0:
-                    domains[(r, c)].discard(value)
-                    if not domains[(r, c)]:
-                        return False
         return True
     
     def get_hint(self, board: SudokuBoard, row: int, col: int) -> Optional[int]:
@@ -122,72 +108,83 @@ class ConstraintPropagationSolver(BaseSolver):
         """Solve with step-by-step visualization"""
         self.metrics.reset()
         self.metrics.start()
-        result = yield from self._solve_with_steps_recursive(board.copy())
+        flat = self._prepare(board)
+        if not flat:
+            self.metrics.stop()
+            yield SolveStep(StepType.FAILED, -1, -1, None, "No solution found")
+            return None
+        result = yield from self._solve_with_steps_recursive(flat)
         self.metrics.stop()
-        return result
+        if result is None:
+            # Dead ends inside the search only show up as backtracks
+            yield SolveStep(StepType.FAILED, -1, -1, None, "No solution found")
+            return None
+        solved = board.copy()
+        self._write_back(solved, result)
+        return solved
     
-    def _solve_with_steps_recursive(self, board: SudokuBoard) -> Generator[SolveStep, None, Optional[SudokuBoard]]:
+    def _solve_with_steps_recursive(self, flat: array) -> Generator[SolveStep, None, Optional[array]]:
         """Recursive solver with step visualization"""
         self.metrics.nodes_visited += 1
         
-        temp_domains = {}
-        for row in range(board.size):
-            for col in range(board.size):
-                if board[row, col] == 0:
-                    temp_domains[(row, col)] = board.get_domain(row, col)
-                    if not temp_domains[(row, col)]:
-                        yield SolveStep(StepType.FAILED, row, col, None,
-                                       f"Empty domain at ({row+1}, {col+1})")
-                        return None
-                else:
-                    temp_domains[(row, col)] = {board[row, col]}
+        temp_domains, empties, dead_cell = self._init_domains(flat)
+        if dead_cell >= 0:
+            return None
         
+        row_mask, col_mask, box_mask = self._row_mask, self._col_mask, self._box_mask
+        assigned = []
         changed = True
         while changed:
             changed = False
-            for (row, col), domain in list(temp_domains.items()):
-                if len(domain) == 1 and board[row, col] == 0:
-                    value = next(iter(domain))
-                    if not board.is_valid_move(row, col, value):
+            for i in range(len(flat)):
+                domain = temp_domains[i]
+                if (domain & (domain - 1)) == 0 and flat[i] == 0:
+                    row, col, box = self._units[i]
+                    if (row_mask[row] | col_mask[col] | box_mask[box]) & domain:
+                        self._undo(flat, assigned)
                         return None
-                    board[row, col] = value
+                    self._place(flat, i, domain)
+                    assigned.append(i)
+                    empties -= 1
                     changed = True
                     self.metrics.domain_reductions += 1
+                    value = flat[i]
                     yield SolveStep(StepType.PROPAGATE, row, col, value,
                                    f"Propagated {value} to ({row+1}, {col+1})",
-                                   copy.deepcopy(temp_domains))
-                    if not self._update_domains(board, temp_domains, row, col, value):
+                                   self._snapshot_domains(flat, temp_domains))
+                    if not self._update_domains(flat, temp_domains, i, domain):
+                        self._undo(flat, assigned)
                         return None
         
-        if board.is_solved():
+        if empties == 0:
             yield SolveStep(StepType.SOLVED, -1, -1, None, "Puzzle solved!")
-            return board
-        
-        empty_cells = [(r, c) for r in range(board.size) for c in range(board.size) 
-                       if board[r, c] == 0]
-        if not empty_cells:
-            return None
-        
-        empty_cells.sort(key=lambda cell: len(temp_domains.get(cell, set())))
-        row, col = empty_cells[0]
-        
-        for value in temp_domains.get((row, col), set()):
-            if board.is_valid_move(row, col, value):
-                yield SolveStep(StepType.TRY, row, col, value,
-                               f"Trying {value} at ({row+1}, {col+1})")
-                
-                new_board = board.copy()
-                new_board[row, col] = value
-                
-                yield SolveStep(StepType.ASSIGN, row, col, value,
-                               f"Assigned {value} to ({row+1}, {col+1})")
-                
-                result = yield from self._solve_with_steps_recursive(new_board)
-                if result:
-                    return result
-                
-                self.metrics.backtrack_count += 1
-                yield SolveStep(StepType.BACKTRACK, row, col, value,
-                               f"Backtracking from ({row+1}, {col+1})")
-        
+            return flat
+        
+        i = min((j for j in range(len(flat)) if flat[j] == 0),
+                key=lambda j: bin(temp_domains[j]).count("1"))
+        row, col, _ = self._units[i]
+        
+        remaining = temp_domains[i]
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            value = bit.bit_length()
+            yield SolveStep(StepType.TRY, row, col, value,
+                           f"Trying {value} at ({row+1}, {col+1})")
+            
+            self._place(flat, i, bit)
+            
+            yield SolveStep(StepType.ASSIGN, row, col, value,
+                           f"Assigned {value} to ({row+1}, {col+1})")
+            
+            result = yield from self._solve_with_steps_recursive(flat)
+            if result:
+                return result
+            
+            self._unplace(flat, i)
+            self.metrics.backtrack_count += 1
+            yield SolveStep(StepType.BACKTRACK, row, col, value,
+                           f"Backtracking from ({row+1}, {col+1})")
+        
+        self._undo(flat, assigned)
         return None
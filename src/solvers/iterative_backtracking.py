@@ -3,7 +3,7 @@ Iterative Backtracking Solver for Sudoku
 Uses explicit stack to avoid recursion depth limits
 """
 
-from typing import Optional, Tuple, Dict, Set, Generator
+from typing import Optional, Tuple, List, Generator
 
 from src.core.board import SudokuBoard
 from src.core.metrics import AlgorithmMetrics
@@ -14,6 +14,9 @@ class IterativeBacktrackingSolver(BaseSolver):
     """
     Iterative Backtracking Search using Stack
     Avoids recursion depth limits for large puzzles
+    
+    Candidates are kept as bitmasks (bit v-1 set = value v allowed),
+    so each stack frame is a single int instead of a list of values.
     """
     
     def solve(self, board: SudokuBoard) -> Tuple[Optional[SudokuBoard], AlgorithmMetrics]:
@@ -22,50 +25,57 @@ class IterativeBacktrackingSolver(BaseSolver):
         self.metrics.start()
         
         # Initial domains
-        domains: Dict[Tuple[int, int], Set[int]] = {}
-        empty_cells = []
-        for row in range(board.size):
-            for col in range(board.size):
-                if board[row, col] == 0:
-                    dom = board.get_domain(row, col)
-                    if not dom:
-                        self.metrics.stop()
-                        return None, self.metrics
-                    domains[(row, col)] = dom
-                    empty_cells.append((row, col))
+        row_mask, col_mask, box_mask, empty_cells = self._init_masks(board)
+        full = (1 << board.size) - 1
+        domains = {}
+        for row, col, box in empty_cells:
+            dom = full & ~(row_mask[row] | col_mask[col] | box_mask[box])
+            if not dom:
+                self.metrics.stop()
+                return None, self.metrics
+            domains[(row, col)] = dom
         
         if not empty_cells:
             self.metrics.stop()
             return board, self.metrics
         
         # Sort by MRV
-        empty_cells.sort(key=lambda rc: len(domains[rc]))
+        empty_cells.sort(key=lambda cell: bin(domains[cell[:2]]).count("1"))
         
-        # Stack-based backtracking
-        stack = []
+        # Stack-based backtracking: one remaining-candidates bitmask per cell
+        stack: List[int] = []
         cell_idx = 0
         
         while 0 <= cell_idx < len(empty_cells):
             self.metrics.nodes_visited += 1
-            row, col = empty_cells[cell_idx]
+            row, col, box = empty_cells[cell_idx]
             
             if cell_idx == len(stack):
-                current_domain = board.get_domain(row, col)
-                stack.append(list(current_domain))
+                stack.append(full & ~(row_mask[row] | col_mask[col] | box_mask[box]))
+            else:
+                # Came back from a dead end: release the value placed here
+                bit = 1 << (board[row, col] - 1)
+                row_mask[row] ^= bit
+                col_mask[col] ^= bit
+                box_mask[box] ^= bit
+                board[row, col] = 0
             
-            values = stack[-1]
+            remaining = stack[-1]
             
-            if not values:
+            if not remaining:
                 stack.pop()
-                board[row, col] = 0
                 cell_idx -= 1
                 self.metrics.backtrack_count += 1
                 continue
             
-            value = values.pop()
-            if board.is_valid_move(row, col, value):
-                board[row, col] = value
-                cell_idx += 1
+            # Highest value first, like popping the ascending candidate list
+            bit = 1 << (remaining.bit_length() - 1)
+            stack[-1] = remaining ^ bit
+            board[row, col] = bit.bit_length()
+            row_mask[row] |= bit
+            col_mask[col] |= bit
+            box_mask[box] |= bit
+            cell_idx += 1
         
         self.metrics.stop()
         
@@ -74,6 +84,32 @@ class IterativeBacktrackingSolver(BaseSolver):
         else:
             return None, self.metrics
     
+    def _init_masks(self, board: SudokuBoard) -> Tuple[List[int], List[int], List[int], List[Tuple[int, int, int]]]:
+        """
+        Build row/column/box masks of placed values
+        
+        Returns:
+            Tuple of (row_mask, col_mask, box_mask, empty cells as (row, col, box))
+        """
+        box_size = board.box_size
+        boxes_per_row = board.size // box_size
+        row_mask = [0] * board.size
+        col_mask = [0] * board.size
+        box_mask = [0] * (boxes_per_row * boxes_per_row)
+        empty_cells = []
+        for row in range(board.size):
+            for col in range(board.size):
+                box = (row // box_size) * boxes_per_row + col // box_size
+                value = board[row, col]
+                if value:
+                    bit = 1 << (value - 1)
+                    row_mask[row] |= bit
+                    col_mask[col] |= bit
+                    box_mask[box] |= bit
+                else:
+                    empty_cells.append((row, col, box))
+        return row_mask, col_mask, box_mask, empty_cells
+    
     def get_hint(self, board: SudokuBoard, row: int, col: int) -> Optional[int]:
         if board[row, col] != 0:
             return None
@@ -85,60 +121,67 @@ class IterativeBacktrackingSolver(BaseSolver):
         self.metrics.reset()
         self.metrics.start()
         
-        domains: Dict[Tuple[int, int], Set[int]] = {}
-        empty_cells = []
-        for row in range(board.size):
-            for col in range(board.size):
-                if board[row, col] == 0:
-                    dom = board.get_domain(row, col)
-                    if not dom:
-                        self.metrics.stop()
-                        yield SolveStep(StepType.FAILED, row, col, None,
-                                       f"Empty domain at ({row+1}, {col+1})")
-                        return None
-                    domains[(row, col)] = dom
-                    empty_cells.append((row, col))
+        row_mask, col_mask, box_mask, empty_cells = self._init_masks(board)
+        full = (1 << board.size) - 1
+        domains = {}
+        for row, col, box in empty_cells:
+            dom = full & ~(row_mask[row] | col_mask[col] | box_mask[box])
+            if not dom:
+                self.metrics.stop()
+                yield SolveStep(StepType.FAILED, row, col, None,
+                               f"Empty domain at ({row+1}, {col+1})")
+                return None
+            domains[(row, col)] = dom
         
         if not empty_cells:
             self.metrics.stop()
             yield SolveStep(StepType.SOLVED, -1, -1, None, "Puzzle solved!")
             return board
         
-        empty_cells.sort(key=lambda rc: len(domains[rc]))
+        empty_cells.sort(key=lambda cell: bin(domains[cell[:2]]).count("1"))
         
-        stack = []
+        stack: List[int] = []
         cell_idx = 0
         
         while 0 <= cell_idx < len(empty_cells):
             self.metrics.nodes_visited += 1
-            row, col = empty_cells[cell_idx]
+            row, col, box = empty_cells[cell_idx]
             
             if cell_idx == len(stack):
-                current_domain = board.get_domain(row, col)
-                stack.append(list(current_domain))
+                stack.append(full & ~(row_mask[row] | col_mask[col] | box_mask[box]))
+            else:
+                bit = 1 << (board[row, col] - 1)
+                row_mask[row] ^= bit
+                col_mask[col] ^= bit
+                box_mask[box] ^= bit
+                board[row, col] = 0
             
-            values = stack[-1]
+            remaining = stack[-1]
             
-            if not values:
+            if not remaining:
                 stack.pop()
-                board[row, col] = 0
                 cell_idx -= 1
                 self.metrics.backtrack_count += 1
                 if cell_idx >= 0:
-                    prev_row, prev_col = empty_cells[cell_idx]
+                    prev_row, prev_col, _ = empty_cells[cell_idx]
                     yield SolveStep(StepType.BACKTRACK, prev_row, prev_col, None,
                                    f"Backtracking from ({prev_row+1}, {prev_col+1})")
                 continue
             
-            value = values.pop()
+            # Highest value first, like popping the ascending candidate list
+            bit = 1 << (remaining.bit_length() - 1)
+            stack[-1] = remaining ^ bit
+            value = bit.bit_length()
             yield SolveStep(StepType.TRY, row, col, value,
                            f"Trying {value} at ({row+1}, {col+1})")
             
-            if board.is_valid_move(row, col, value):
-                board[row, col] = value
-                cell_idx += 1
-                yield SolveStep(StepType.ASSIGN, row, col, value,
-                               f"Assigned {value} to ({row+1}, {col+1})")
+            board[row, col] = value
+            row_mask[row] |= bit
+            col_mask[col] |= bit
+            box_mask[box] |= bit
+            cell_idx += 1
+            yield SolveStep(StepType.ASSIGN, row, col, value,
+                           f"Assigned {value} to ({row+1}, {col+1})")
         
         self.metrics.stop()
         
@@ -4,7 +4,8 @@ Handles animation timing, pause/resume, and step management
 """
 
 import time
-from typing import Generator, Optional, Callable, List
+from collections import deque
+from typing import Generator, Optional, Callable, Deque, List
 from dataclasses import dataclass
 from enum import Enum
 from src.solvers.base import SolveStep, StepType
@@ -33,6 +34,8 @@ class AnimationSettings:
     speed: AnimationSpeed = AnimationSpeed.NORMAL
     skip_try_steps: bool = False  # Skip "TRY" steps for faster visualization
     highlight_duration: int = 100  # How long to highlight a cell (ms)
+    history_size: int = 1024  # Recent steps kept in memory for replay
+    record_full: bool = False  # Keep every step instead of only the recent ones
 
 
 class AnimationController:
@@ -44,9 +47,13 @@ class AnimationController:
     def __init__(self):
         self.state = AnimationState.IDLE
         self.settings = AnimationSettings()
-        self.steps: List[SolveStep] = []
-        self.current_step_index = 0
+        # Only the most recent settings.history_size steps are kept, unless
+        # settings.record_full is set; total_steps counts every step run
+        self.steps: Deque[SolveStep] = self._new_history()
+        self.total_steps = 0
+        self.current_step_index = 0  # Index of the latest step within steps
         self.step_generator: Optional[Generator] = None
+        self._step_counts: List[int] = [0] * len(StepType)
         
         # Callbacks
         self.on_step: Optional[Callable[[SolveStep, int], None]] = None
@@ -89,8 +96,10 @@ class AnimationController:
             step_generator: Generator from solver.solve_with_steps()
         """
         self.step_generator = step_generator
-        self.steps = []
+        self.steps = self._new_history()
+        self.total_steps = 0
         self.current_step_index = 0
+        self._step_counts = [0] * len(StepType)
         self._pause_requested = False
         self._stop_requested = False
         self._set_state(AnimationState.PLAYING)
@@ -124,9 +133,11 @@ class AnimationController:
             step = next(self.step_generator)
             self.steps.append(step)
             self.current_step_index = len(self.steps) - 1
+            self.total_steps += 1
+            self._step_counts[step.step_type] += 1
             
             if self.on_step:
-                self.on_step(step, self.current_step_index)
+                self.on_step(step, self.total_steps - 1)
             
             if step.step_type == StepType.SOLVED:
                 self._set_state(AnimationState.FINISHED)
@@ -173,28 +184,32 @@ class AnimationController:
     
     def get_statistics(self) -> dict:
         """Get animation statistics"""
-        step_counts = {st: 0 for st in StepType}
-        for step in self.steps:
-            step_counts[step.step_type] += 1
-        
         return {
-            'total_steps': len(self.steps),
-            'current_step': self.current_step_index,
-            'step_counts': step_counts,
+            'total_steps': self.total_steps,
+            'current_step': max(self.total_steps - 1, 0),
+            'step_counts': {st: self._step_counts[st] for st in StepType},
             'state': self.state.value
         }
     
     def reset(self):
         """Reset controller to initial state"""
         self.state = AnimationState.IDLE
-        self.steps = []
+        self.steps = self._new_history()
+        self.total_steps = 0
         self.current_step_index = 0
         self.step_generator = None
+        self._step_counts = [0] * len(StepType)
         self._pause_requested = False
         self._stop_requested = False
         if hasattr(self, '_custom_delay'):
             delattr(self, '_custom_delay')
     
+    def _new_history(self) -> Deque[SolveStep]:
+        """Create the step history, bounded unless full recording is enabled"""
+        if self.settings.record_full:
+            return deque()
+        return deque(maxlen=self.settings.history_size)
+    
     def _set_state(self, new_state: AnimationState):
         """Set state and notify listeners"""
         old_state = self.state